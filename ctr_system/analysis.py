@@ -2,6 +2,7 @@
 # ABOUTME: Gap analysis and benchmark calculation for CTR system
 # ABOUTME: Identifies underperforming pages with position-adjusted CTR expectations
 
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -10,11 +11,15 @@ from .config import (
     MIN_IMPRESSIONS_FOR_ANALYSIS,
     MIN_CTR_GAP_PERCENT,
     MIN_IMPACT_SCORE,
+    MIN_DAYS_BETWEEN_CHANGES,
     MAX_EXPERIMENTS_PER_MONTH
 )
 from . import database as db
 from .gsc_client import get_gsc_client
 
+# Concurrent GSC requests (the API is network-latency-bound, not CPU-bound)
+GSC_MAX_WORKERS = 16
+
 
 def refresh_benchmarks(days: int = 90) -> List[Dict]:
     """Calculate and store site-specific CTR benchmarks"""
@@ -51,94 +56,161 @@ def analyze_all_pages(review_id: int, days: int = 90) -> List[Dict]:
     pages = client.get_all_pages(start_date, end_date, MIN_IMPRESSIONS_FOR_ANALYSIS)
     print(f"  Found {len(pages)} pages with {MIN_IMPRESSIONS_FOR_ANALYSIS}+ impressions")
 
+    # One bulk query per table replaces the per-page tracking and
+    # change-history lookups for eligibility
+    eligibility = db.get_eligibility_bulk([p['page_url'] for p in pages])
+
     # Auto-track first-seen dates for new pages
     print("  Auto-tracking first-seen dates from GSC...")
     new_pages_tracked = 0
+    untracked_urls = {url for url, (days_first, _) in eligibility.items() if days_first is None}
+    first_seen_map = {}
+    if untracked_urls:
+        # First-seen discovery walks GSC history per page - fetch concurrently
+        with ThreadPoolExecutor(max_workers=GSC_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(client.get_page_first_seen_date, url): url
+                for url in untracked_urls
+            }
+            for future in as_completed(futures):
+                first_seen_map[futures[future]] = future.result()
+
+    # One batched upsert covers both new-page tracking and last-seen refresh;
+    # existing rows keep their first_seen_date on conflict
+    tracking_rows = []
     for page in pages:
         page_url = page['page_url']
-
-        # Check if we've tracked this page before
-        if db.get_page_first_seen(page_url) is None:
-            # New page - find when it first appeared in GSC
-            first_seen = client.get_page_first_seen_date(page_url)
-            if first_seen:
-                db.track_page_first_seen(
-                    page_url=page_url,
-                    page_slug=page['page_slug'],
-                    first_seen_date=first_seen
-                )
-                new_pages_tracked += 1
-
-        # Update last-seen date
-        db.update_page_last_seen(page_url, end_date)
+        if page_url in untracked_urls:
+            first_seen = first_seen_map.get(page_url)
+            if not first_seen:
+                continue  # No GSC history found; nothing to record yet
+            new_pages_tracked += 1
+        else:
+            first_seen = end_date  # Ignored on conflict
+        tracking_rows.append((page_url, page['page_slug'], first_seen, end_date))
+
+    db.upsert_page_tracking_bulk(tracking_rows)
+
+    # Newly tracked pages now have a first-seen date; reflect it in the
+    # eligibility map so the age check below sees them
+    for page_url, first_seen in first_seen_map.items():
+        if first_seen:
+            days_first = (datetime.now() - datetime.strptime(first_seen, '%Y-%m-%d')).days
+            eligibility[page_url] = (days_first, eligibility[page_url][1])
 
     if new_pages_tracked > 0:
         print(f"    Tracked {new_pages_tracked} new pages from GSC")
 
-    # Analyze each page
-    results = []
-    for i, page in enumerate(pages):
+    # Phase 1a: fetch post-change metrics for recently-changed pages in
+    # one bulk query, sliced per-page by each page's own window
+    page_last_change = db.get_last_change_map([p['page_url'] for p in pages])
+    adj_ranges = {
+        url: client.get_valid_date_range(lc)
+        for url, lc in page_last_change.items() if lc
+    }
+    adj_metrics_map = client.get_pages_metrics_bulk(
+        {url: rng for url, rng in adj_ranges.items() if rng is not None}
+    )
+
+    # Phase 1b: decide which pages to keep and which date range applies
+    work_items = []
+    for page in pages:
         page_url = page['page_url']
         page_slug = page['page_slug']
+        page_start = start_date
+        page_end = end_date
 
-        # Get time-adjusted metrics if page was recently changed
-        last_change = db.get_last_change_date(page_url)
+        # Use time-adjusted metrics if page was recently changed
+        last_change = page_last_change[page_url]
         if last_change:
-            # Get metrics only from after the change
-            date_range = client.get_valid_date_range(last_change)
+            date_range = adj_ranges[page_url]
 
             # If change is too recent (no valid data yet), skip this page
             if date_range is None:
                 continue
 
-            adj_start, adj_end = date_range
-            adj_metrics = client.get_page_metrics(page_url, adj_start, adj_end)
+            adj_metrics = adj_metrics_map.get(page_url)
 
             if adj_metrics and adj_metrics['impressions'] >= MIN_IMPRESSIONS_FOR_ANALYSIS:
                 page = adj_metrics
                 page['page_slug'] = page_slug
-                start_date = adj_start
-                end_date = adj_end
+                page_start, page_end = date_range
             # If not enough post-change data, skip this page
             elif adj_metrics:
                 continue
 
-        # Calculate expected CTR based on position
-        expected_ctr = db.get_expected_ctr(page['position'])
-
-        # Get top queries
-        queries = client.get_queries_for_page(page_url, start_date, end_date)
-
-        # Store in database
-        db.store_gsc_metrics(
-            page_url=page_url,
-            page_slug=page_slug,
-            start_date=start_date,
-            end_date=end_date,
-            impressions=page['impressions'],
-            clicks=page['clicks'],
-            ctr=page['ctr'],
-            position=page['position'],
-            expected_ctr=expected_ctr,
-            top_queries=queries[:10],  # Store top 10 queries
-            review_id=review_id
-        )
+        work_items.append((page, page_start, page_end))
+
+    # Phase 1c: fetch top queries concurrently for all kept pages
+    queries_map = {}
+    if work_items:
+        with ThreadPoolExecutor(max_workers=GSC_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(client.get_queries_for_page, p['page_url'], ps, pe): p['page_url']
+                for p, ps, pe in work_items
+            }
+            for future in as_completed(futures):
+                queries_map[futures[future]] = future.result()
+
+    # Phase 2: compute derived fields, collecting metric rows for one batched insert
+    # Derived columns computed for all kept pages up-front: one lookup call
+    # for expected CTRs, one pass each for gaps and impact scores
+    expected_ctrs = db.get_expected_ctrs([p['position'] for p, _, _ in work_items])
+    ctr_gaps = [e - p['ctr'] for e, (p, _, _) in zip(expected_ctrs, work_items)]
+    impact_scores = [p['impressions'] * max(g, 0) for g, (p, _, _) in zip(ctr_gaps, work_items)]
+    # Serialize the stored top-10 query lists in one compact pass
+    top_queries_json = [
+        db._json_dumps(queries_map.get(p['page_url'], [])[:10])
+        for p, _, _ in work_items
+    ]
+
+    results = []
+    metrics_rows = []
+    for i, (page, page_start, page_end) in enumerate(work_items):
+        page_url = page['page_url']
+        page_slug = page['page_slug']
+        last_change = page_last_change[page_url]
+        expected_ctr = expected_ctrs[i]
+        ctr_gap = ctr_gaps[i]
+        impact_score = impact_scores[i]
+
+        queries = queries_map.get(page_url, [])
+
+        # Derive remaining stored fields (last_change already fetched above)
+        if last_change is not None:
+            naive_change = last_change.replace(tzinfo=None) if last_change.tzinfo else last_change
+            days_since = (datetime.now() - naive_change).days
+            can_optimize = days_since >= MIN_DAYS_BETWEEN_CHANGES
+        else:
+            days_since = None
+            can_optimize = True  # Never optimized
+
+        # Queue metrics snapshot for one batched insert after the loop
+        metrics_rows.append((
+            page_url, page_slug,
+            page_start, page_end,
+            page['impressions'], page['clicks'], page['ctr'], page['position'],
+            expected_ctr, ctr_gap, impact_score,
+            days_since, last_change.date() if last_change else None, can_optimize,
+            top_queries_json[i], review_id  # Store top 10 queries
+        ))
 
         # Add to results
         page['expected_ctr'] = expected_ctr
-        page['ctr_gap'] = expected_ctr - page['ctr']
-        page['impact_score'] = page['impressions'] * max(page['ctr_gap'], 0)
+        page['ctr_gap'] = ctr_gap
+        page['impact_score'] = impact_score
         page['top_queries'] = queries
 
         # Check eligibility: old enough AND enough time since last change
-        page['eligible'] = (
-            db.is_page_old_enough_for_optimization(page_url, min_days=30) and
-            db.can_optimize_page(page_url)
-        )
+        days_since_first_seen = eligibility[page_url][0]
+        old_enough = days_since_first_seen is None or days_since_first_seen >= 30
+        page['eligible'] = old_enough and can_optimize
         results.append(page)
 
         if (i + 1) % 50 == 0:
-            print(f"    Processed {i + 1}/{len(pages)} pages...")
+            print(f"    Processed {i + 1}/{len(work_items)} pages...")
+
+    db.bulk_store_gsc_metrics(metrics_rows)
 
     print(f"  Analysis complete: {len(results)} pages processed")
     return results
@@ -155,45 +227,27 @@ def get_top_opportunities(review_id: int) -> List[Dict]:
 
     This means: if 40 pages need optimization, optimize all 40 (vs old behavior of only 20)
     """
-    opportunities = db.get_optimization_opportunities(
+    # Rows arrive pre-shaped from SQL (aliases + computed ctr_gap_pct)
+    return db.get_optimization_opportunities(
         review_id=review_id,
         min_ctr_gap_percent=MIN_CTR_GAP_PERCENT,
         min_impact_score=MIN_IMPACT_SCORE,
         max_results=MAX_EXPERIMENTS_PER_MONTH
     )
 
-    # Enrich with additional calculated fields
-    results = []
-    for opp in opportunities:
-        results.append({
-            'page_url': opp['page_url'],
-            'page_slug': opp['page_slug'],
-            'impressions': opp['impressions'],
-            'clicks': opp['clicks'],
-            'current_ctr': opp['ctr'],
-            'expected_ctr': opp['expected_ctr'],
-            'ctr_gap': opp['ctr_gap'],
-            'ctr_gap_pct': (opp['ctr_gap'] / opp['expected_ctr'] * 100) if opp['expected_ctr'] > 0 else 0,
-            'position': opp['position'],
-            'impact_score': opp['impact_score'],
-            'days_since_change': opp['days_since_last_change'],
-            'top_queries': opp['top_queries'],
-            'eligible': opp['eligible_for_optimization']
-        })
-
-    return results
-
 
 def calculate_potential_impact(opportunities: List[Dict]) -> Dict:
     """Calculate the total potential impact of optimizing these pages"""
-    total_impressions = sum(o['impressions'] for o in opportunities)
-    current_clicks = sum(o['clicks'] for o in opportunities)
-
-    # Estimate potential clicks if we hit expected CTR
-    potential_clicks = sum(
-        o['impressions'] * o['expected_ctr']
-        for o in opportunities
-    )
+    # Accumulate all totals in one pass over the list
+    total_impressions = 0
+    current_clicks = 0
+    potential_clicks = 0.0
+    for o in opportunities:
+        impressions = o['impressions']
+        total_impressions += impressions
+        current_clicks += o['clicks']
+        # Estimate potential clicks if we hit expected CTR
+        potential_clicks += impressions * o['expected_ctr']
 
     potential_gain = potential_clicks - current_clicks
 
@@ -254,14 +308,21 @@ def generate_analysis_summary(opportunities: List[Dict]) -> str:
         ""
     ]
 
-    for i, opp in enumerate(opportunities[:10], 1):
-        lines.append(f"**{i}. {opp['page_slug']}**")
-        lines.append(f"   - CTR: {opp['current_ctr']*100:.2f}% (expected {opp['expected_ctr']*100:.2f}%)")
-        lines.append(f"   - Gap: -{opp['ctr_gap_pct']:.1f}%")
-        lines.append(f"   - Position: {opp['position']:.1f}")
-        lines.append(f"   - Impressions: {opp['impressions']:,}")
+    # Render each opportunity as a single block; percentages precomputed once
+    top = opportunities[:10]
+    current_pcts = [o['current_ctr'] * 100 for o in top]
+    expected_pcts = [o['expected_ctr'] * 100 for o in top]
+    for i, (opp, current, expected) in enumerate(zip(top, current_pcts, expected_pcts), 1):
+        block = (
+            f"**{i}. {opp['page_slug']}**\n"
+            f"   - CTR: {current:.2f}% (expected {expected:.2f}%)\n"
+            f"   - Gap: -{opp['ctr_gap_pct']:.1f}%\n"
+            f"   - Position: {opp['position']:.1f}\n"
+            f"   - Impressions: {opp['impressions']:,}"
+        )
         if opp['days_since_change'] is not None:
-            lines.append(f"   - Days since last change: {opp['days_since_change']}")
+            block += f"\n   - Days since last change: {opp['days_since_change']}"
+        lines.append(block)
         lines.append("")
 
     return "\n".join(lines)
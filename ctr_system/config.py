@@ -3,6 +3,7 @@
 # ABOUTME: Thresholds, paths, and settings for all modules
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -173,6 +174,9 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 NOTIFICATION_EMAIL = os.getenv("NOTIFICATION_EMAIL")
 
+# Send weekly status even when there is nothing to report
+NOTIFY_ON_EMPTY = os.getenv("CTR_NOTIFY_ON_EMPTY", "0") == "1"
+
 # =============================================================================
 # OUTCOME THRESHOLDS
 # =============================================================================
@@ -186,8 +190,14 @@ WORSENED_THRESHOLD = -0.05   # 5% decline = "worsened"
 POSITION_CHANGE_THRESHOLD = 2.0  # Flag if position changed by more than 2
 
 
+@lru_cache(maxsize=1)
 def validate_config():
-    """Check that required configuration is present"""
+    """Check that required configuration is present.
+
+    Settings are read once at import, so the answer can't change within
+    a process; the result is cached (the PATH scan for the Claude CLI is
+    the expensive part). Use validate_config.cache_clear() to re-check.
+    """
     import shutil
 
     errors = []
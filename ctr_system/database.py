@@ -4,9 +4,14 @@
 
 import os
 import json
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterator
 from contextlib import contextmanager
+from io import StringIO
 
 from .config import DB_PATH, MIN_DAYS_BETWEEN_CHANGES, MIN_DAYS_FOR_EVALUATION
 
@@ -17,42 +22,201 @@ USE_POSTGRES = DATABASE_URL is not None
 if USE_POSTGRES:
     import psycopg2
     from psycopg2.extras import RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
 else:
     import sqlite3
 
+    # Return DATE/TIMESTAMP columns as native date/datetime objects so
+    # callers skip per-row strptime. Registered explicitly because the
+    # stdlib's default converters are deprecated from Python 3.12.
+    sqlite3.register_converter(
+        "DATE", lambda b: date.fromisoformat(b.decode()))
+    sqlite3.register_converter(
+        "TIMESTAMP", lambda b: datetime.fromisoformat(b.decode().replace('Z', '+00:00')))
+
+# orjson is much faster on list-of-dict payloads (top_queries); fall back
+# to stdlib json when it isn't installed
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'))
+
+    _json_loads = json.loads
+
+
+# Hot-path DDL applied once per process so existing databases pick up
+# indexes added after their schema.sql was first run
+_indexes_ensured = False
+
+
+_HOT_PATH_INDEXES = (
+    # Per-page MAX(changed_at) as an index endpoint probe
+    """CREATE INDEX IF NOT EXISTS idx_seo_changes_url_time
+       ON seo_changes(page_url, changed_at DESC)""",
+    # get_optimization_opportunities: review scan ordered by impact
+    """CREATE INDEX IF NOT EXISTS idx_gsc_metrics_review_impact
+       ON gsc_page_metrics(review_id, impact_score DESC)
+       WHERE eligible_for_optimization = 1""",
+    # get_page_ctr_history: per-page review join
+    """CREATE INDEX IF NOT EXISTS idx_gsc_metrics_page_review
+       ON gsc_page_metrics(page_url, review_id)""",
+    # get_experiments_ready_for_evaluation: active-only partial index
+    """CREATE INDEX IF NOT EXISTS idx_experiments_active_eval
+       ON optimization_experiments(min_evaluation_date)
+       WHERE status = 'active'""",
+    # get_unused_ideas: per-page unused-idea probe
+    """CREATE INDEX IF NOT EXISTS idx_ideas_page_selected
+       ON title_ideas(page_url, selected)""",
+)
+
+
+def _ensure_indexes(conn):
+    global _indexes_ensured
+    if _indexes_ensured:
+        return
+    try:
+        # Denormalized review_month (see get_page_ctr_history); ALTER
+        # fails harmlessly once the column exists
+        conn.execute("ALTER TABLE gsc_page_metrics ADD COLUMN review_month CHAR(7)")
+        conn.execute("""
+            UPDATE gsc_page_metrics
+            SET review_month = (SELECT review_month FROM monthly_reviews
+                                WHERE id = review_id)
+            WHERE review_month IS NULL
+        """)
+    except sqlite3.Error:
+        pass
+    try:
+        for ddl in _HOT_PATH_INDEXES:
+            conn.execute(ddl)
+        conn.execute("ANALYZE")  # Refresh planner stats so it uses them
+    except sqlite3.Error:
+        pass  # Tables not created yet; schema.sql will add the indexes
+    # Commit the bootstrap explicitly: the backfill UPDATE opens an
+    # implicit transaction on this long-lived connection, and a
+    # read-only run would otherwise hold it (and the write lock) for
+    # the life of the process, blocking other processes
+    conn.commit()
+    _indexes_ensured = True
+
+
+# One SQLite connection per thread, kept open for the process lifetime.
+# Tuned for this read-heavy workload: WAL lets readers skip writer locks,
+# NORMAL sync + in-memory temp store cut fsync/disk churn, and the mmap /
+# page-cache sizes keep the working set off the syscall path.
+_sqlite_local = threading.local()
+
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+
+# Long-lived Postgres pool: TCP + TLS + auth per statement is far more
+# expensive than SQLite's open, so connections are created once and reused
+_pg_pool = None
+_pg_pool_lock = threading.Lock()
+
+# Postgres twin of the review_month migration in _ensure_indexes, run
+# once per process so existing deployments don't need a manual ALTER
+_pg_schema_ensured = False
+_pg_schema_lock = threading.Lock()
+
+
+def _ensure_pg_schema(conn):
+    global _pg_schema_ensured
+    if _pg_schema_ensured:
+        return
+    with _pg_schema_lock:
+        if _pg_schema_ensured:
+            return
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    "ALTER TABLE gsc_page_metrics ADD COLUMN IF NOT EXISTS review_month CHAR(7)")
+                cursor.execute("""
+                    UPDATE gsc_page_metrics
+                    SET review_month = (SELECT review_month FROM monthly_reviews
+                                        WHERE id = review_id)
+                    WHERE review_month IS NULL
+                """)
+            conn.commit()
+        except psycopg2.Error:
+            conn.rollback()  # Tables not created yet; schema.sql adds the column
+        _pg_schema_ensured = True
+
+
+def _get_pg_pool():
+    global _pg_pool
+    if _pg_pool is None:
+        with _pg_pool_lock:
+            if _pg_pool is None:
+                # Force IPv4 for GitHub Actions compatibility - resolved
+                # once at pool construction, not per connection
+                import socket
+                from urllib.parse import urlparse
+
+                parsed = urlparse(DATABASE_URL)
+                kwargs = {}
+                try:
+                    addr_info = socket.getaddrinfo(
+                        parsed.hostname, parsed.port or 5432, socket.AF_INET
+                    )
+                    if addr_info:
+                        kwargs['hostaddr'] = addr_info[0][4][0]
+                except (socket.gaierror, IndexError):
+                    pass
+
+                _pg_pool = ThreadedConnectionPool(1, 8, DATABASE_URL, **kwargs)
+    return _pg_pool
+
 
 @contextmanager
 def get_connection():
     """Get database connection - PostgreSQL if SUPABASE_DATABASE_URL is set, else SQLite"""
     if USE_POSTGRES:
-        # Force IPv4 for GitHub Actions compatibility
-        import socket
-        from urllib.parse import urlparse
-
-        parsed = urlparse(DATABASE_URL)
-        hostname = parsed.hostname
-
-        try:
-            addr_info = socket.getaddrinfo(hostname, parsed.port or 5432, socket.AF_INET)
-            if addr_info:
-                ipv4_addr = addr_info[0][4][0]
-                conn = psycopg2.connect(DATABASE_URL, hostaddr=ipv4_addr)
-            else:
-                conn = psycopg2.connect(DATABASE_URL)
-        except (socket.gaierror, IndexError):
-            conn = psycopg2.connect(DATABASE_URL)
-
+        pool = _get_pg_pool()
+        conn = pool.getconn()
+        _ensure_pg_schema(conn)
         try:
             yield conn
+        except Exception:
+            conn.rollback()
+            raise
         finally:
-            conn.close()
+            pool.putconn(conn)
     else:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = getattr(_sqlite_local, 'conn', None)
+        if conn is None:
+            # Larger prepared-statement cache: hot helpers replay the
+            # same statements thousands of times per review
+            conn = sqlite3.connect(
+                DB_PATH,
+                cached_statements=256,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+            )
+            # Dicts straight from the driver; saves the per-row
+            # Row -> dict copy every getter used to do
+            conn.row_factory = _dict_factory
+            for pragma in SQLITE_PRAGMAS:
+                conn.execute(pragma)
+            _ensure_indexes(conn)
+            _sqlite_local.conn = conn
         try:
             yield conn
-        finally:
-            conn.close()
+        except Exception:
+            # Leave the reused connection clean for the next caller
+            conn.rollback()
+            raise
 
 
 def _get_cursor(conn):
@@ -67,13 +231,72 @@ def _placeholder():
     return "%s" if USE_POSTGRES else "?"
 
 
+# SQLite's default variable limit is 999; stay under it for IN clauses
+_IN_CHUNK_SIZE = 500
+
+
+def _copy_escape(value) -> str:
+    """Escape a value for Postgres COPY text format (default \\N null)"""
+    if value is None:
+        return r'\N'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+def _parse_ymd(value: str) -> datetime:
+    """Parse a fixed YYYY-MM-DD string (~10x faster than strptime)"""
+    return datetime(int(value[0:4]), int(value[5:7]), int(value[8:10]))
+
+
+# Hot-path SQL built once at import time; the per-call f-string
+# interpolation otherwise rebuilds (and re-hashes) identical statements
+_PH = _placeholder()
+_SQL_LAST_CHANGE = f"""
+    SELECT MAX(changed_at) as last_change
+    FROM seo_changes
+    WHERE page_url = {_PH}
+"""
+_SQL_FIRST_SEEN = f"""
+    SELECT first_seen_date
+    FROM gsc_page_tracking
+    WHERE page_url = {_PH}
+"""
+_SQL_BENCHMARKS = """
+    SELECT position_min, position_max, expected_ctr, sample_size
+    FROM ctr_benchmarks
+    ORDER BY position_min
+"""
+_SQL_MARK_IDEA_USED = f"""
+    UPDATE title_ideas
+    SET selected = TRUE,
+        used_at = CURRENT_TIMESTAMP,
+        experiment_id = {_PH}
+    WHERE id = {_PH}
+"""
+_SQL_PAST_IDEAS = f"""
+    SELECT idea_text, idea_type, selected, used_at
+    FROM title_ideas
+    WHERE page_url = {_PH}
+"""
+_SQL_UNUSED_IDEAS = f"""
+    SELECT *
+    FROM title_ideas
+    WHERE page_url = {_PH} AND selected = FALSE
+    ORDER BY generated_at DESC
+"""
+
+
+def _dict_factory(cursor, row):
+    """Row factory producing plain dicts, skipping the sqlite3.Row hop"""
+    return {col[0]: row[i] for i, col in enumerate(cursor.description)}
+
+
 def _row_to_dict(row):
-    """Convert a row to a dictionary"""
-    if row is None:
-        return None
-    if USE_POSTGRES:
-        return dict(row)
-    return dict(row)
+    """Convert a row to a dictionary (rows already arrive as dicts)"""
+    return row
 
 
 # =============================================================================
@@ -82,14 +305,11 @@ def _row_to_dict(row):
 
 def get_last_change_date(page_url: str) -> Optional[datetime]:
     """Get the date of the most recent SEO change for a page"""
-    ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute(f"""
-            SELECT MAX(changed_at) as last_change
-            FROM seo_changes
-            WHERE page_url = {ph}
-        """, (page_url,))
+        if not USE_POSTGRES:
+            cursor.row_factory = None  # Plain tuples; skip Row wrapping per call
+        cursor.execute(_SQL_LAST_CHANGE, (page_url,))
         row = cursor.fetchone()
 
     if row:
@@ -101,6 +321,38 @@ def get_last_change_date(page_url: str) -> Optional[datetime]:
     return None
 
 
+def get_last_change_map(urls: List[str]) -> Dict[str, Optional[datetime]]:
+    """Get most-recent change dates for many pages in one grouped query.
+
+    URLs with no recorded change map to None.
+    """
+    ph = _placeholder()
+    result: Dict[str, Optional[datetime]] = {url: None for url in urls}
+
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        if not USE_POSTGRES:
+            cursor.row_factory = None
+        for start in range(0, len(urls), _IN_CHUNK_SIZE):
+            chunk = urls[start:start + _IN_CHUNK_SIZE]
+            placeholders = ", ".join([ph] * len(chunk))
+            cursor.execute(f"""
+                SELECT page_url, MAX(changed_at) as last_change
+                FROM seo_changes
+                WHERE page_url IN ({placeholders})
+                GROUP BY page_url
+            """, chunk)
+            for row in cursor.fetchall():
+                url = row['page_url'] if USE_POSTGRES else row[0]
+                val = row['last_change'] if USE_POSTGRES else row[1]
+                if val:
+                    if isinstance(val, str):
+                        val = datetime.fromisoformat(val.replace('Z', '+00:00'))
+                    result[url] = val
+
+    return result
+
+
 def get_days_since_last_change(page_url: str) -> Optional[int]:
     """Get number of days since last change, or None if never changed"""
     last_change = get_last_change_date(page_url)
@@ -113,10 +365,29 @@ def get_days_since_last_change(page_url: str) -> Optional[int]:
 
 def can_optimize_page(page_url: str) -> bool:
     """Check if enough time has passed since last change"""
-    days = get_days_since_last_change(page_url)
-    if days is None:
+    ph = _placeholder()
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        # Threshold math in SQL: one boolean crosses the boundary instead
+        # of a date that Python would parse and subtract
+        if USE_POSTGRES:
+            cursor.execute(f"""
+                SELECT EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - MAX(changed_at))) / 86400 >= {ph} AS ok
+                FROM seo_changes
+                WHERE page_url = {ph}
+            """, (MIN_DAYS_BETWEEN_CHANGES, page_url))
+        else:
+            cursor.execute(f"""
+                SELECT (julianday('now') - julianday(MAX(changed_at))) >= {ph} AS ok
+                FROM seo_changes
+                WHERE page_url = {ph}
+            """, (MIN_DAYS_BETWEEN_CHANGES, page_url))
+        row = cursor.fetchone()
+
+    ok = row['ok']
+    if ok is None:
         return True  # Never optimized
-    return days >= MIN_DAYS_BETWEEN_CHANGES
+    return bool(ok)
 
 
 def record_seo_change(
@@ -154,14 +425,11 @@ def record_seo_change(
 
 def get_page_first_seen(page_url: str) -> Optional[str]:
     """Get the first-seen date for a page from tracking table"""
-    ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute(f"""
-            SELECT first_seen_date
-            FROM gsc_page_tracking
-            WHERE page_url = {ph}
-        """, (page_url,))
+        if not USE_POSTGRES:
+            cursor.row_factory = None  # Plain tuples; skip Row wrapping per call
+        cursor.execute(_SQL_FIRST_SEEN, (page_url,))
         row = cursor.fetchone()
 
     if row:
@@ -173,25 +441,21 @@ def get_page_first_seen(page_url: str) -> Optional[str]:
 def track_page_first_seen(page_url: str, page_slug: str, first_seen_date: str, wp_post_id: Optional[int] = None):
     """Record when a page first appeared in GSC"""
     ph = _placeholder()
+    now_date = "CURRENT_DATE" if USE_POSTGRES else "date('now')"
+    now_ts = "CURRENT_TIMESTAMP" if USE_POSTGRES else "datetime('now')"
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        if USE_POSTGRES:
-            cursor.execute(f"""
-                INSERT INTO gsc_page_tracking (
-                    page_url, page_slug, first_seen_date, wp_post_id,
-                    last_seen_date, last_updated
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, CURRENT_DATE, CURRENT_TIMESTAMP)
-                ON CONFLICT (page_url) DO UPDATE SET
-                    last_seen_date = CURRENT_DATE,
-                    last_updated = CURRENT_TIMESTAMP
-            """, (page_url, page_slug, first_seen_date, wp_post_id))
-        else:
-            cursor.execute(f"""
-                INSERT OR REPLACE INTO gsc_page_tracking (
-                    page_url, page_slug, first_seen_date, wp_post_id,
-                    last_seen_date, last_updated
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, date('now'), datetime('now'))
-            """, (page_url, page_slug, first_seen_date, wp_post_id))
+        # Single upsert on both backends; preserves the original
+        # first_seen_date on conflict (INSERT OR REPLACE would clobber it)
+        cursor.execute(f"""
+            INSERT INTO gsc_page_tracking (
+                page_url, page_slug, first_seen_date, wp_post_id,
+                last_seen_date, last_updated
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {now_date}, {now_ts})
+            ON CONFLICT (page_url) DO UPDATE SET
+                last_seen_date = excluded.last_seen_date,
+                last_updated = excluded.last_updated
+        """, (page_url, page_slug, first_seen_date, wp_post_id))
         conn.commit()
 
 
@@ -220,16 +484,89 @@ def get_days_since_first_seen(page_url: str) -> Optional[int]:
     first_seen = get_page_first_seen(page_url)
     if not first_seen:
         return None
-    first_date = datetime.strptime(first_seen, '%Y-%m-%d')
+    first_date = _parse_ymd(first_seen)
     return (datetime.now() - first_date).days
 
 
 def is_page_old_enough_for_optimization(page_url: str, min_days: int = 30) -> bool:
     """Check if page has been in GSC long enough to optimize"""
-    days = get_days_since_first_seen(page_url)
-    if days is None:
+    ph = _placeholder()
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        if USE_POSTGRES:
+            cursor.execute(f"""
+                SELECT (CURRENT_DATE - first_seen_date) >= {ph} AS ok
+                FROM gsc_page_tracking
+                WHERE page_url = {ph}
+            """, (min_days, page_url))
+        else:
+            cursor.execute(f"""
+                SELECT (julianday('now') - julianday(first_seen_date)) >= {ph} AS ok
+                FROM gsc_page_tracking
+                WHERE page_url = {ph}
+            """, (min_days, page_url))
+        row = cursor.fetchone()
+
+    if row is None:
         return True  # Not tracked yet, will be discovered
-    return days >= min_days
+    ok = row['ok']
+    if ok is None:
+        return True
+    return bool(ok)
+
+
+def get_eligibility_bulk(urls: List[str]) -> Dict[str, tuple]:
+    """Get (days_since_first_seen, days_since_last_change) for many pages.
+
+    Runs one IN query per table (chunked) instead of two queries per
+    page. URLs with no tracking row or no recorded change map to None
+    for that value.
+    """
+    ph = _placeholder()
+    now = datetime.now()
+    first_seen_days: Dict[str, int] = {}
+    last_change_days: Dict[str, int] = {}
+
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        if not USE_POSTGRES:
+            cursor.row_factory = None  # Plain tuples for the bulk scans
+        for start in range(0, len(urls), _IN_CHUNK_SIZE):
+            chunk = urls[start:start + _IN_CHUNK_SIZE]
+            placeholders = ", ".join([ph] * len(chunk))
+
+            cursor.execute(f"""
+                SELECT page_url, first_seen_date
+                FROM gsc_page_tracking
+                WHERE page_url IN ({placeholders})
+            """, chunk)
+            for row in cursor.fetchall():
+                url = row['page_url'] if USE_POSTGRES else row[0]
+                val = row['first_seen_date'] if USE_POSTGRES else row[1]
+                if val:
+                    first_date = _parse_ymd(str(val))
+                    first_seen_days[url] = (now - first_date).days
+
+            cursor.execute(f"""
+                SELECT page_url, MAX(changed_at) as last_change
+                FROM seo_changes
+                WHERE page_url IN ({placeholders})
+                GROUP BY page_url
+            """, chunk)
+            for row in cursor.fetchall():
+                url = row['page_url'] if USE_POSTGRES else row[0]
+                val = row['last_change'] if USE_POSTGRES else row[1]
+                if val:
+                    if isinstance(val, str):
+                        val = datetime.fromisoformat(val.replace('Z', '+00:00'))
+                    if val.tzinfo is not None:
+                        val = val.replace(tzinfo=None)
+                    last_change_days[url] = (now - val).days
+
+    return {
+        url: (first_seen_days.get(url), last_change_days.get(url))
+        for url in urls
+    }
 
 
 # =============================================================================
@@ -262,8 +599,40 @@ def log_historical_gsc_data(page_url: str, data_date: str, impressions: int, cli
         conn.commit()
 
 
-def get_historical_data(page_url: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
-    """Get historical GSC data for a page"""
+def log_historical_gsc_data_bulk(records: List[tuple]):
+    """Log many historical GSC data points in one transaction.
+
+    records are (page_url, data_date, impressions, clicks, ctr, position)
+    tuples. Duplicate (page_url, data_date) rows are ignored, so backfills
+    can safely overlap already-logged ranges.
+    """
+    if not records:
+        return
+    ph = _placeholder()
+    if USE_POSTGRES:
+        conflict = "ON CONFLICT (page_url, data_date) DO NOTHING"
+        verb = "INSERT"
+    else:
+        conflict = ""
+        verb = "INSERT OR IGNORE"
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.executemany(f"""
+            {verb} INTO gsc_historical_data (
+                page_url, data_date, impressions, clicks, ctr, position
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+            {conflict}
+        """, records)
+        conn.commit()
+
+
+def iter_historical_data(page_url: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Iterator[Dict]:
+    """Stream historical GSC data for a page in bounded memory.
+
+    Fetches in fixed-size batches so long histories (daily rows over
+    years) never need a full materialized list; use get_historical_data
+    when a list is actually wanted.
+    """
     ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
@@ -281,8 +650,16 @@ def get_historical_data(page_url: str, start_date: Optional[str] = None, end_dat
                 WHERE page_url = {ph}
                 ORDER BY data_date
             """, (page_url,))
-        rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+        while True:
+            rows = cursor.fetchmany(1000)
+            if not rows:
+                break
+            yield from rows
+
+
+def get_historical_data(page_url: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> List[Dict]:
+    """Get historical GSC data for a page"""
+    return list(iter_historical_data(page_url, start_date, end_date))
 
 
 # =============================================================================
@@ -293,13 +670,23 @@ def get_benchmarks() -> List[Dict]:
     """Get CTR benchmarks by position band"""
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute("""
-            SELECT position_min, position_max, expected_ctr, sample_size
-            FROM ctr_benchmarks
-            ORDER BY position_min
-        """)
+        cursor.execute(_SQL_BENCHMARKS)
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
+
+
+@lru_cache(maxsize=1)
+def _benchmark_lookup() -> tuple:
+    """Benchmark bounds and CTRs as parallel tuples, cached per-process.
+
+    get_expected_ctr is called once per page during analysis; the
+    benchmark table (~7 rows) only changes via update_benchmarks, which
+    clears this cache. Sorted position_min bounds allow a bisect lookup.
+    """
+    benchmarks = get_benchmarks()
+    mins = tuple(b['position_min'] for b in benchmarks)
+    ctrs = tuple(b['expected_ctr'] for b in benchmarks)
+    return mins, ctrs
 
 
 def update_benchmarks(benchmarks: List[Dict]):
@@ -308,18 +695,21 @@ def update_benchmarks(benchmarks: List[Dict]):
     with get_connection() as conn:
         cursor = _get_cursor(conn)
         cursor.execute("DELETE FROM ctr_benchmarks")
-        for b in benchmarks:
-            cursor.execute(f"""
-                INSERT INTO ctr_benchmarks (position_min, position_max, expected_ctr, sample_size)
-                VALUES ({ph}, {ph}, {ph}, {ph})
-            """, (b['position_min'], b['position_max'], b['expected_ctr'], b.get('sample_size', 0)))
+        cursor.executemany(f"""
+            INSERT INTO ctr_benchmarks (position_min, position_max, expected_ctr, sample_size)
+            VALUES ({ph}, {ph}, {ph}, {ph})
+        """, [
+            (b['position_min'], b['position_max'], b['expected_ctr'], b.get('sample_size', 0))
+            for b in benchmarks
+        ])
         conn.commit()
+    _benchmark_lookup.cache_clear()
 
 
 def get_expected_ctr(position: float) -> float:
     """Get expected CTR for a given position"""
-    benchmarks = get_benchmarks()
-    if not benchmarks:
+    mins, ctrs = _benchmark_lookup()
+    if not ctrs:
         # Fallback to rough estimate
         if position <= 1.5:
             return 0.30
@@ -332,10 +722,18 @@ def get_expected_ctr(position: float) -> float:
         else:
             return 0.01
 
-    for b in benchmarks:
-        if b['position_min'] <= position < b['position_max']:
-            return b['expected_ctr']
-    return benchmarks[-1]['expected_ctr']
+    # Bands are contiguous, so the band whose position_min precedes the
+    # position is the match; positions past the last band fall into it too
+    idx = bisect_right(mins, position) - 1
+    return ctrs[max(idx, 0)]
+
+
+def get_expected_ctrs(positions: List[float]) -> List[float]:
+    """Get expected CTRs for a whole list of positions in one call"""
+    mins, ctrs = _benchmark_lookup()
+    if not ctrs:
+        return [get_expected_ctr(p) for p in positions]
+    return [ctrs[max(bisect_right(mins, p) - 1, 0)] for p in positions]
 
 
 # =============================================================================
@@ -364,45 +762,83 @@ def create_experiment(
 
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        if USE_POSTGRES:
-            cursor.execute(f"""
-                INSERT INTO optimization_experiments (
-                    page_url, page_slug, wp_post_id,
-                    hypothesis, idea_type,
-                    old_title, new_title,
-                    pre_ctr, pre_position, pre_impressions, pre_clicks,
-                    pre_measurement_start, pre_measurement_end,
-                    min_evaluation_date, outcome, status, review_id
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, 'pending', 'active', {ph})
-                RETURNING id
-            """, (
+        # RETURNING works on both backends (SQLite 3.35+)
+        cursor.execute(f"""
+            INSERT INTO optimization_experiments (
                 page_url, page_slug, wp_post_id,
                 hypothesis, idea_type,
                 old_title, new_title,
                 pre_ctr, pre_position, pre_impressions, pre_clicks,
-                pre_start_date, pre_end_date,
-                min_eval_date, review_id
-            ))
-            experiment_id = cursor.fetchone()['id']
-        else:
-            cursor.execute(f"""
-                INSERT INTO optimization_experiments (
-                    page_url, page_slug, wp_post_id,
-                    hypothesis, idea_type,
-                    old_title, new_title,
-                    pre_ctr, pre_position, pre_impressions, pre_clicks,
-                    pre_measurement_start, pre_measurement_end,
-                    min_evaluation_date, outcome, status, review_id
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, 'pending', 'active', {ph})
-            """, (
+                pre_measurement_start, pre_measurement_end,
+                min_evaluation_date, outcome, status, review_id
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, 'pending', 'active', {ph})
+            RETURNING id
+        """, (
+            page_url, page_slug, wp_post_id,
+            hypothesis, idea_type,
+            old_title, new_title,
+            pre_ctr, pre_position, pre_impressions, pre_clicks,
+            pre_start_date, pre_end_date,
+            min_eval_date, review_id
+        ))
+        experiment_id = cursor.fetchone()['id']
+        conn.commit()
+    return experiment_id
+
+
+def create_experiment_with_change_log(
+    page_url: str,
+    page_slug: str,
+    wp_post_id: int,
+    hypothesis: str,
+    idea_type: str,
+    old_title: str,
+    new_title: str,
+    pre_ctr: float,
+    pre_position: float,
+    pre_impressions: int,
+    pre_clicks: int,
+    pre_start_date: str,
+    pre_end_date: str,
+    review_id: Optional[int] = None
+) -> int:
+    """Create an experiment and its seo_changes entry in one transaction"""
+    ph = _placeholder()
+    min_eval_date = (datetime.now() + timedelta(days=MIN_DAYS_FOR_EVALUATION)).date()
+
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.execute(f"""
+            INSERT INTO optimization_experiments (
                 page_url, page_slug, wp_post_id,
                 hypothesis, idea_type,
                 old_title, new_title,
                 pre_ctr, pre_position, pre_impressions, pre_clicks,
-                pre_start_date, pre_end_date,
-                min_eval_date, review_id
-            ))
-            experiment_id = cursor.lastrowid
+                pre_measurement_start, pre_measurement_end,
+                min_evaluation_date, outcome, status, review_id
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, 'pending', 'active', {ph})
+            RETURNING id
+        """, (
+            page_url, page_slug, wp_post_id,
+            hypothesis, idea_type,
+            old_title, new_title,
+            pre_ctr, pre_position, pre_impressions, pre_clicks,
+            pre_start_date, pre_end_date,
+            min_eval_date, review_id
+        ))
+        experiment_id = cursor.fetchone()['id']
+        cursor.execute(f"""
+            INSERT INTO seo_changes
+            (page_url, wp_post_id, field_changed, old_value, new_value,
+             change_reason, gsc_ctr_at_change, gsc_impressions_at_change, gsc_clicks_at_change)
+            VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+        """, (
+            page_url, wp_post_id, 'rank_math_title',
+            old_title, new_title,
+            f"CTR experiment: {hypothesis}",
+            pre_ctr * 100,  # Store as percentage
+            pre_impressions, pre_clicks
+        ))
         conn.commit()
     return experiment_id
 
@@ -430,7 +866,7 @@ def get_active_experiments() -> List[Dict]:
                 ORDER BY started_at DESC
             """)
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
 def get_experiments_ready_for_evaluation() -> List[Dict]:
@@ -456,7 +892,7 @@ def get_experiments_ready_for_evaluation() -> List[Dict]:
                 ORDER BY started_at
             """)
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
 def update_experiment_metrics(
@@ -511,6 +947,21 @@ def complete_experiment(
             WHERE id = {ph}
         """, (outcome, ctr_change_pct, position_change, learnings, experiment_id))
         conn.commit()
+    _idea_perf_cache['rows'] = None  # New outcome changes the aggregation
+
+
+def get_known_post_id(page_slug: str) -> Optional[int]:
+    """WordPress post id recorded for a slug by a past experiment, if any"""
+    ph = _placeholder()
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.execute(f"""
+            SELECT wp_post_id FROM optimization_experiments
+            WHERE page_slug = {ph} AND wp_post_id IS NOT NULL
+            ORDER BY id DESC LIMIT 1
+        """, (page_slug,))
+        row = cursor.fetchone()
+    return row['wp_post_id'] if row else None
 
 
 def get_experiment_history(page_url: str) -> List[Dict]:
@@ -525,98 +976,84 @@ def get_experiment_history(page_url: str) -> List[Dict]:
             ORDER BY started_at DESC
         """, (page_url,))
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
 # =============================================================================
 # TITLE IDEAS
 # =============================================================================
 
-def store_title_ideas(page_url: str, ideas: List[Dict], review_id: Optional[int] = None):
-    """Store generated title ideas for a page"""
+def store_title_ideas(page_url: str, ideas: List[Dict], review_id: Optional[int] = None) -> Dict[str, int]:
+    """Store generated title ideas for a page.
+
+    Returns an {idea_text: id} map covering the batch (including ideas
+    that already existed), so callers never need per-idea lookups.
+    """
+    if not ideas:
+        return {}
     ph = _placeholder()
+    rows = [
+        (
+            page_url,
+            idea['text'],
+            len(idea['text']),
+            idea['type'],
+            idea.get('hypothesis', ''),
+            review_id,
+            idea.get('source', 'ai_generated')
+        )
+        for idea in ideas
+    ]
+    # Duplicates are dropped by the engine's conflict clause, so one
+    # executemany in one transaction covers the whole batch
+    conflict = "ON CONFLICT (page_url, idea_text) DO NOTHING" if USE_POSTGRES else ""
+    verb = "INSERT" if USE_POSTGRES else "INSERT OR IGNORE"
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        for idea in ideas:
-            try:
-                if USE_POSTGRES:
-                    cursor.execute(f"""
-                        INSERT INTO title_ideas (
-                            page_url, idea_text, char_count, idea_type, hypothesis,
-                            generated_for_review_id, source
-                        ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                        ON CONFLICT (page_url, idea_text) DO NOTHING
-                    """, (
-                        page_url,
-                        idea['text'],
-                        len(idea['text']),
-                        idea['type'],
-                        idea.get('hypothesis', ''),
-                        review_id,
-                        idea.get('source', 'ai_generated')
-                    ))
-                else:
-                    cursor.execute(f"""
-                        INSERT OR IGNORE INTO title_ideas (
-                            page_url, idea_text, char_count, idea_type, hypothesis,
-                            generated_for_review_id, source
-                        ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
-                    """, (
-                        page_url,
-                        idea['text'],
-                        len(idea['text']),
-                        idea['type'],
-                        idea.get('hypothesis', ''),
-                        review_id,
-                        idea.get('source', 'ai_generated')
-                    ))
-            except Exception:
-                pass  # Skip duplicates
+        cursor.executemany(f"""
+            {verb} INTO title_ideas (
+                page_url, idea_text, char_count, idea_type, hypothesis,
+                generated_for_review_id, source
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+            {conflict}
+        """, rows)
         conn.commit()
 
+        # executemany can't RETURNING, so one batched SELECT recovers the
+        # generated (or pre-existing) ids for the whole batch
+        texts = [row[1] for row in rows]
+        placeholders = ", ".join([ph] * len(texts))
+        cursor.execute(f"""
+            SELECT idea_text, id FROM title_ideas
+            WHERE page_url = {ph} AND idea_text IN ({placeholders})
+        """, [page_url] + texts)
+        return {r['idea_text']: r['id'] for r in cursor.fetchall()}
+
 
 def mark_idea_used(idea_id: int, experiment_id: int):
     """Mark an idea as used in an experiment"""
-    ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute(f"""
-            UPDATE title_ideas
-            SET selected = TRUE,
-                used_at = CURRENT_TIMESTAMP,
-                experiment_id = {ph}
-            WHERE id = {ph}
-        """, (experiment_id, idea_id))
+        cursor.execute(_SQL_MARK_IDEA_USED, (experiment_id, idea_id))
         conn.commit()
 
 
 def get_past_ideas(page_url: str) -> List[Dict]:
     """Get all past ideas for a page (to avoid duplicates)"""
-    ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute(f"""
-            SELECT idea_text, idea_type, selected, used_at
-            FROM title_ideas
-            WHERE page_url = {ph}
-        """, (page_url,))
+        cursor.execute(_SQL_PAST_IDEAS, (page_url,))
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
 def get_unused_ideas(page_url: str) -> List[Dict]:
     """Get generated but unused ideas for a page"""
-    ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        cursor.execute(f"""
-            SELECT *
-            FROM title_ideas
-            WHERE page_url = {ph} AND selected = FALSE
-            ORDER BY generated_at DESC
-        """, (page_url,))
+        cursor.execute(_SQL_UNUSED_IDEAS, (page_url,))
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
 # =============================================================================
@@ -630,25 +1067,15 @@ def create_monthly_review(review_date: datetime, gsc_start: str, gsc_end: str) -
 
     with get_connection() as conn:
         cursor = _get_cursor(conn)
-        if USE_POSTGRES:
-            cursor.execute(f"""
-                INSERT INTO monthly_reviews (
-                    review_date, review_month,
-                    gsc_data_start, gsc_data_end,
-                    status
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, 'draft')
-                RETURNING id
-            """, (review_date.date(), review_month, gsc_start, gsc_end))
-            review_id = cursor.fetchone()['id']
-        else:
-            cursor.execute(f"""
-                INSERT INTO monthly_reviews (
-                    review_date, review_month,
-                    gsc_data_start, gsc_data_end,
-                    status
-                ) VALUES ({ph}, {ph}, {ph}, {ph}, 'draft')
-            """, (review_date.date(), review_month, gsc_start, gsc_end))
-            review_id = cursor.lastrowid
+        cursor.execute(f"""
+            INSERT INTO monthly_reviews (
+                review_date, review_month,
+                gsc_data_start, gsc_data_end,
+                status
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, 'draft')
+            RETURNING id
+        """, (review_date.date(), review_month, gsc_start, gsc_end))
+        review_id = cursor.fetchone()['id']
         conn.commit()
     return review_id
 
@@ -677,6 +1104,34 @@ def update_review_stats(
         conn.commit()
 
 
+def finalize_monthly_review(review_id: int, stats: Dict, report_path: str):
+    """Write final stats and completion state in a single UPDATE.
+
+    Replaces the update_review_stats + complete_monthly_review pair at
+    the end of a review run: one write transaction, one fsync.
+    """
+    ph = _placeholder()
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.execute(f"""
+            UPDATE monthly_reviews
+            SET total_pages_analyzed = {ph},
+                pages_eligible = {ph},
+                opportunities_identified = {ph},
+                experiments_proposed = {ph},
+                experiments_started = {ph},
+                status = 'completed',
+                completed_at = CURRENT_TIMESTAMP,
+                report_path = {ph}
+            WHERE id = {ph}
+        """, (
+            stats['total_pages'], stats['pages_eligible'],
+            stats['opportunities'], stats['experiments_proposed'],
+            stats['experiments_started'], report_path, review_id
+        ))
+        conn.commit()
+
+
 def complete_monthly_review(review_id: int, report_path: str):
     """Mark monthly review as completed"""
     ph = _placeholder()
@@ -703,7 +1158,7 @@ def get_latest_review() -> Optional[Dict]:
             LIMIT 1
         """)
         row = cursor.fetchone()
-    return dict(row) if row else None
+    return row if row else None
 
 
 # =============================================================================
@@ -730,14 +1185,26 @@ def store_learning(
             ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
         """, (
             learning_type, category, idea_type, insight,
-            json.dumps(supporting_data) if supporting_data else None,
+            _json_dumps(supporting_data) if supporting_data else None,
             sample_size, confidence
         ))
         conn.commit()
+    _learnings_cache.clear()  # New learning invalidates cached reads
+
+
+# Learnings only change via store_learning; cache reads per filter with
+# the same short TTL as the idea-type summary
+_learnings_cache: Dict[Optional[str], tuple] = {}
+_LEARNINGS_TTL = 300.0  # seconds
 
 
 def get_learnings(idea_type: Optional[str] = None) -> List[Dict]:
-    """Get learnings, optionally filtered by idea type"""
+    """Get learnings, optionally filtered by idea type (cached briefly)"""
+    now = time.monotonic()
+    cached = _learnings_cache.get(idea_type)
+    if cached is not None and now - cached[1] < _LEARNINGS_TTL:
+        return cached[0]
+
     ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
@@ -755,11 +1222,23 @@ def get_learnings(idea_type: Optional[str] = None) -> List[Dict]:
                 ORDER BY confidence DESC, sample_size DESC
             """)
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+
+    _learnings_cache[idea_type] = (rows, now)
+    return rows
+
+
+# Idea-type performance only changes when an experiment completes, so the
+# aggregation is cached with a short TTL and cleared from complete_experiment
+_idea_perf_cache: Dict[str, Any] = {'rows': None, 'at': 0.0}
+_IDEA_PERF_TTL = 300.0  # seconds
 
 
 def get_idea_type_performance() -> List[Dict]:
-    """Get performance summary by idea type"""
+    """Get performance summary by idea type (cached for a few minutes)"""
+    now = time.monotonic()
+    if _idea_perf_cache['rows'] is not None and now - _idea_perf_cache['at'] < _IDEA_PERF_TTL:
+        return _idea_perf_cache['rows']
+
     with get_connection() as conn:
         cursor = _get_cursor(conn)
         if USE_POSTGRES:
@@ -783,13 +1262,32 @@ def get_idea_type_performance() -> List[Dict]:
                 ORDER BY success_rate DESC
             """)
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+
+    result = rows
+    _idea_perf_cache['rows'] = result
+    _idea_perf_cache['at'] = now
+    return result
 
 
 # =============================================================================
 # GSC PAGE METRICS
 # =============================================================================
 
+@lru_cache(maxsize=32)
+def _review_month(review_id: Optional[int]) -> Optional[str]:
+    """review_month for a review id — immutable once created, so cached"""
+    if review_id is None:
+        return None
+    ph = _placeholder()
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.execute(
+            f"SELECT review_month FROM monthly_reviews WHERE id = {ph}",
+            (review_id,))
+        row = cursor.fetchone()
+    return row['review_month'] if row else None
+
+
 def store_gsc_metrics(
     page_url: str,
     page_slug: str,
@@ -808,9 +1306,15 @@ def store_gsc_metrics(
     ctr_gap = expected_ctr - ctr
     impact_score = impressions * max(ctr_gap, 0)
 
-    days_since = get_days_since_last_change(page_url)
+    # One change-history lookup serves all three derived fields
     last_change = get_last_change_date(page_url)
-    eligible = can_optimize_page(page_url)
+    if last_change is not None:
+        naive_change = last_change.replace(tzinfo=None) if last_change.tzinfo else last_change
+        days_since = (datetime.now() - naive_change).days
+        eligible = days_since >= MIN_DAYS_BETWEEN_CHANGES
+    else:
+        days_since = None
+        eligible = True  # Never optimized
 
     with get_connection() as conn:
         cursor = _get_cursor(conn)
@@ -821,33 +1325,120 @@ def store_gsc_metrics(
                 impressions, clicks, ctr, position,
                 expected_ctr, ctr_gap, impact_score,
                 days_since_last_change, last_change_date, eligible_for_optimization,
-                top_queries, review_id
-            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
+                top_queries, review_id, review_month
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph}, {ph})
         """, (
             page_url, page_slug,
             start_date, end_date,
             impressions, clicks, ctr, position,
             expected_ctr, ctr_gap, impact_score,
             days_since, last_change.date() if last_change else None, eligible,
-            json.dumps(top_queries), review_id
+            _json_dumps(top_queries), review_id, _review_month(review_id)
         ))
         conn.commit()
 
 
+def bulk_store_gsc_metrics(rows: List[tuple]):
+    """Store many GSC metric snapshots in one transaction.
+
+    Each row must match the column order used by store_gsc_metrics:
+    (page_url, page_slug, measurement_start, measurement_end,
+     impressions, clicks, ctr, position, expected_ctr, ctr_gap, impact_score,
+     days_since_last_change, last_change_date, eligible_for_optimization,
+     top_queries_json, review_id)
+
+    review_month is filled in here (one cached lookup per review).
+    """
+    if not rows:
+        return
+    ph = _placeholder()
+    rows = [row + (_review_month(row[-1]),) for row in rows]
+    columns = """
+        page_url, page_slug,
+        measurement_start, measurement_end,
+        impressions, clicks, ctr, position,
+        expected_ctr, ctr_gap, impact_score,
+        days_since_last_change, last_change_date, eligible_for_optimization,
+        top_queries, review_id, review_month
+    """
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        if USE_POSTGRES and len(rows) > 1000:
+            # COPY skips per-row parameter encoding; worthwhile for
+            # full-site reviews
+            buf = StringIO()
+            for row in rows:
+                buf.write('\t'.join(_copy_escape(v) for v in row))
+                buf.write('\n')
+            buf.seek(0)
+            cursor.copy_expert(
+                f"COPY gsc_page_metrics ({columns}) FROM STDIN", buf)
+        else:
+            placeholders = ', '.join([ph] * 17)
+            cursor.executemany(f"""
+                INSERT INTO gsc_page_metrics ({columns})
+                VALUES ({placeholders})
+            """, rows)
+        conn.commit()
+
+
+def upsert_page_tracking_bulk(rows: List[tuple]):
+    """Insert-or-update page tracking rows in one batched statement.
+
+    Each row is (page_url, page_slug, first_seen_date, last_seen_date).
+    Existing rows keep their first_seen_date; only the last-seen fields
+    are refreshed on conflict.
+    """
+    if not rows:
+        return
+    ph = _placeholder()
+    now_expr = "CURRENT_TIMESTAMP" if USE_POSTGRES else "datetime('now')"
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        cursor.executemany(f"""
+            INSERT INTO gsc_page_tracking (
+                page_url, page_slug, first_seen_date, last_seen_date, last_updated
+            ) VALUES ({ph}, {ph}, {ph}, {ph}, {now_expr})
+            ON CONFLICT (page_url) DO UPDATE SET
+                last_seen_date = excluded.last_seen_date,
+                last_updated = excluded.last_updated
+        """, rows)
+        conn.commit()
+
+
 def get_optimization_opportunities(
     review_id: int,
     min_ctr_gap_percent: float = 15.0,
     min_impact_score: float = 5.0,
     max_results: int = 50
 ) -> List[Dict]:
-    """Get optimization opportunities from a review based on CTR gap thresholds"""
+    """Get optimization opportunities from a review based on CTR gap thresholds.
+
+    Rows come back already shaped for the analysis layer: columns are
+    aliased to their report names and ctr_gap_pct is computed in SQL.
+    """
     ph = _placeholder()
     min_ctr_gap = min_ctr_gap_percent / 100.0
 
     with get_connection() as conn:
         cursor = _get_cursor(conn)
         cursor.execute(f"""
-            SELECT *
+            SELECT
+                page_url,
+                page_slug,
+                impressions,
+                clicks,
+                ctr AS current_ctr,
+                expected_ctr,
+                ctr_gap,
+                CASE WHEN expected_ctr > 0
+                     THEN ctr_gap / expected_ctr * 100.0
+                     ELSE 0 END AS ctr_gap_pct,
+                position,
+                impact_score,
+                days_since_last_change AS days_since_change,
+                top_queries,
+                eligible_for_optimization AS eligible
             FROM gsc_page_metrics
             WHERE review_id = {ph}
               AND eligible_for_optimization = TRUE
@@ -857,41 +1448,86 @@ def get_optimization_opportunities(
             LIMIT {ph}
         """, (review_id, min_ctr_gap, min_impact_score, max_results))
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+
+    # Decode top_queries once here so report and orchestrator loops
+    # get lists, not JSON strings
+    for row in rows:
+        queries = row.get('top_queries')
+        if isinstance(queries, (str, bytes)):
+            row['top_queries'] = _json_loads(queries)
+    return rows
 
 
 def get_page_ctr_history(page_url: str, months: int = 6) -> List[Dict]:
-    """Get historical CTR progression for a page across monthly reviews"""
+    """Get historical CTR progression for a page across monthly reviews.
+
+    review_month is denormalized onto gsc_page_metrics at insert time,
+    so this reads a single table with no join.
+    """
     ph = _placeholder()
     with get_connection() as conn:
         cursor = _get_cursor(conn)
         cursor.execute(f"""
-            SELECT
-                mr.review_month,
-                gpm.ctr,
-                gpm.position,
-                gpm.impressions,
-                gpm.clicks
-            FROM gsc_page_metrics gpm
-            JOIN monthly_reviews mr ON gpm.review_id = mr.id
-            WHERE gpm.page_url = {ph}
-            ORDER BY mr.review_date DESC
+            SELECT review_month, ctr, position, impressions, clicks
+            FROM gsc_page_metrics
+            WHERE page_url = {ph} AND review_month IS NOT NULL
+            ORDER BY review_month DESC
             LIMIT {ph}
         """, (page_url, months))
         rows = cursor.fetchall()
-    return [dict(row) for row in rows]
+    return rows
 
 
-def format_ctr_progression(page_url: str, months: int = 3) -> str:
-    """Format historical CTR as a progression string"""
-    history = get_page_ctr_history(page_url, months)
+_MONTH_ABBR = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+               'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+def _format_progression(history: List[Dict]) -> str:
+    """Format a page's CTR history rows as a progression string"""
     if not history:
         return "No history"
 
-    history = list(reversed(history))
-    progression = []
-    for h in history:
-        month_abbr = datetime.strptime(h['review_month'], '%Y-%m').strftime('%b')
-        ctr_pct = int(h['ctr'] * 100)
-        progression.append(f"{month_abbr} {ctr_pct}%")
-    return " → ".join(progression)
+    # review_month is always 'YYYY-MM'; slice it instead of strptime
+    return " → ".join(
+        f"{_MONTH_ABBR[int(h['review_month'][5:7])]} {int(h['ctr'] * 100)}%"
+        for h in reversed(history)
+    )
+
+
+def format_ctr_progression(page_url: str, months: int = 3) -> str:
+    """Format historical CTR as a progression string"""
+    return _format_progression(get_page_ctr_history(page_url, months))
+
+
+def format_ctr_progression_bulk(page_urls: List[str], months: int = 3) -> Dict[str, str]:
+    """Format CTR progressions for many pages with one query per chunk.
+
+    Replaces the per-page format_ctr_progression calls in report loops.
+    """
+    if not page_urls:
+        return {}
+
+    ph = _placeholder()
+    histories: Dict[str, List[Dict]] = {url: [] for url in page_urls}
+    unique_urls = list(histories)
+
+    with get_connection() as conn:
+        cursor = _get_cursor(conn)
+        for i in range(0, len(unique_urls), _IN_CHUNK_SIZE):
+            chunk = unique_urls[i:i + _IN_CHUNK_SIZE]
+            placeholders = ','.join([ph] * len(chunk))
+            # Newest months come out last per page, matching the
+            # ascending order _format_progression renders
+            cursor.execute(f"""
+                SELECT page_url, review_month, ctr
+                FROM gsc_page_metrics
+                WHERE page_url IN ({placeholders}) AND review_month IS NOT NULL
+                ORDER BY page_url, review_month
+            """, chunk)
+            for row in cursor.fetchall():
+                histories[row['page_url']].append(row)
+
+    return {
+        url: _format_progression(list(reversed(history[-months:])))
+        for url, history in histories.items()
+    }
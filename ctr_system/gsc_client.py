@@ -3,15 +3,21 @@
 # ABOUTME: Supports service account and OAuth authentication, per-page date filtering
 
 import os
+import re
 import json
+import threading
+from bisect import bisect_right
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, List, Dict, Tuple
 from pathlib import Path
 
+import httplib2
 from google.oauth2.service_account import Credentials as ServiceAccountCredentials
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 
 from .config import WP_SITE_URL, MIN_IMPRESSIONS_FOR_ANALYSIS
@@ -28,12 +34,46 @@ CREDENTIALS_FILE = Path(os.getenv('GSC_CREDENTIALS_FILE', str(Path(__file__).par
 TOKEN_FILE = Path(os.getenv('GSC_TOKEN_FILE', str(Path(__file__).parent.parent / 'gsc_token.json')))
 SERVICE_ACCOUNT_JSON = os.getenv('GSC_SERVICE_ACCOUNT_JSON', '')
 
+# Site URL prefixes stripped from page URLs to derive slugs; compiled
+# once since _url_to_slug runs for every row of a 25k-page response
+_SLUG_PREFIX_RE = re.compile(
+    r'^(?:' + re.escape(SITE_URL) + r'|https://themeaningmovement\.com/)'
+)
+
+
+# Invariant request fragments shared across calls. Only immutable-by-use
+# parts live here: the page filter itself varies per call (and calls run
+# on a thread pool), so that leaf is always allocated fresh.
+_DIMS_PAGE = ['page']
+_DIMS_QUERY = ['query']
+_DIMS_DATE = ['date']
+_DIMS_PAGE_DATE = ['page', 'date']
+
+
+def _page_filter(page_url: str) -> List[Dict]:
+    """dimensionFilterGroups for an exact page match"""
+    return [{
+        'filters': [{
+            'dimension': 'page',
+            'operator': 'equals',
+            'expression': page_url
+        }]
+    }]
+
 
 class GSCClient:
     """Google Search Console API client"""
 
     def __init__(self):
         self.service = None
+        self._creds = None
+        # httplib2 is not thread-safe: each worker thread gets its own
+        # authorized transport (see _http) so pooled queries never share
+        # a socket
+        self._thread_http = threading.local()
+        # Memoized per-page metric responses; get_page_first_seen_date
+        # re-queries overlapping ranges heavily during discovery
+        self._page_metrics_cache: Dict[tuple, Optional[Dict]] = {}
         self._authenticate()
 
     def _authenticate(self):
@@ -53,6 +93,7 @@ class GSCClient:
                 'or ensure GSC_CREDENTIALS_FILE exists for OAuth.'
             )
 
+        self._creds = creds
         self.service = build('searchconsole', 'v1', credentials=creds)
 
     def _get_service_account_credentials(self) -> Optional[ServiceAccountCredentials]:
@@ -94,12 +135,27 @@ class GSCClient:
 
         return creds
 
+    def _http(self) -> AuthorizedHttp:
+        """Authorized transport owned by the calling thread.
+
+        The discovery service's default transport is one shared httplib2
+        object, which interleaves on its socket when the thread pools in
+        analysis/measurement call _query concurrently. Credentials are
+        shared (google-auth handles refresh locking); the Http object is
+        not, so each thread builds its own once and reuses it.
+        """
+        http = getattr(self._thread_http, 'http', None)
+        if http is None:
+            http = AuthorizedHttp(self._creds, http=httplib2.Http())
+            self._thread_http.http = http
+        return http
+
     def _query(self, request_body: Dict) -> List[Dict]:
         """Execute a GSC query"""
         response = self.service.searchanalytics().query(
             siteUrl=SITE_URL,
             body=request_body
-        ).execute()
+        ).execute(http=self._http())
         return response.get('rows', [])
 
     def get_all_pages(
@@ -112,7 +168,7 @@ class GSCClient:
         request = {
             'startDate': start_date,
             'endDate': end_date,
-            'dimensions': ['page'],
+            'dimensions': _DIMS_PAGE,
             'rowLimit': 25000,
             'startRow': 0
         }
@@ -140,35 +196,112 @@ class GSCClient:
         self,
         page_url: str,
         start_date: str,
-        end_date: str
+        end_date: str,
+        min_impressions: int = 0
     ) -> Optional[Dict]:
-        """Get metrics for a specific page in a date range"""
+        """Get metrics for a specific page in a date range.
+
+        The GSC API can only filter on dimensions, not metric values, so
+        min_impressions is applied to the returned row; pages below the
+        threshold come back as None so callers can skip follow-up calls.
+
+        Responses are memoized per (page, range, threshold): GSC data for
+        a closed date range is stable, so repeat lookups within a run
+        skip the API round-trip entirely.
+        """
+        cache_key = (page_url, start_date, end_date, min_impressions)
+        if cache_key in self._page_metrics_cache:
+            cached = self._page_metrics_cache[cache_key]
+            return dict(cached) if cached else None
+
         request = {
             'startDate': start_date,
             'endDate': end_date,
-            'dimensions': ['page'],
-            'dimensionFilterGroups': [{
-                'filters': [{
-                    'dimension': 'page',
-                    'operator': 'equals',
-                    'expression': page_url
-                }]
-            }],
+            'dimensions': _DIMS_PAGE,
+            'dimensionFilterGroups': _page_filter(page_url),
             'rowLimit': 1
         }
 
         rows = self._query(request)
 
+        result = None
         if rows:
             row = rows[0]
-            return {
-                'page_url': page_url,
-                'impressions': row.get('impressions', 0),
-                'clicks': row.get('clicks', 0),
-                'ctr': row.get('ctr', 0),
-                'position': row.get('position', 0)
-            }
-        return None
+            impressions = row.get('impressions', 0)
+            if impressions >= min_impressions:
+                result = {
+                    'page_url': page_url,
+                    'impressions': impressions,
+                    'clicks': row.get('clicks', 0),
+                    'ctr': row.get('ctr', 0),
+                    'position': row.get('position', 0)
+                }
+
+        if len(self._page_metrics_cache) >= 4096:
+            self._page_metrics_cache.clear()
+        self._page_metrics_cache[cache_key] = result
+        # Hand out a copy so callers (e.g. get_page_with_queries) can
+        # annotate it without polluting the cache
+        return dict(result) if result else None
+
+    def get_pages_metrics_bulk(
+        self,
+        page_windows: Dict[str, Tuple[str, str]]
+    ) -> Dict[str, Optional[Dict]]:
+        """Get metrics for many pages, each over its own date window.
+
+        Instead of one filtered API call per page, fetches page x date
+        rows across the widest needed window in a single (paginated)
+        query, then aggregates each page's rows over its own window
+        locally. Position is impression-weighted, matching GSC's own
+        server-side aggregation.
+        """
+        if not page_windows:
+            return {}
+
+        start_date = min(w[0] for w in page_windows.values())
+        end_date = max(w[1] for w in page_windows.values())
+
+        totals = {url: [0, 0, 0.0, False] for url in page_windows}  # imp, clicks, pos*imp, seen
+        start_row = 0
+        while True:
+            rows = self._query({
+                'startDate': start_date,
+                'endDate': end_date,
+                'dimensions': _DIMS_PAGE_DATE,
+                'rowLimit': 25000,
+                'startRow': start_row
+            })
+            if not rows:
+                break
+            for row in rows:
+                page_url, row_date = row['keys']
+                window = page_windows.get(page_url)
+                if window is None or not (window[0] <= row_date <= window[1]):
+                    continue
+                impressions = row.get('impressions', 0)
+                totals_row = totals[page_url]
+                totals_row[0] += impressions
+                totals_row[1] += row.get('clicks', 0)
+                totals_row[2] += row.get('position', 0) * impressions
+                totals_row[3] = True
+            if len(rows) < 25000:
+                break
+            start_row += len(rows)
+
+        results = {}
+        for page_url, (impressions, clicks, weighted_pos, seen) in totals.items():
+            if not seen:
+                results[page_url] = None  # No GSC rows in the window
+            else:
+                results[page_url] = {
+                    'page_url': page_url,
+                    'impressions': impressions,
+                    'clicks': clicks,
+                    'ctr': (clicks / impressions) if impressions else 0,
+                    'position': (weighted_pos / impressions) if impressions else 0
+                }
+        return results
 
     def get_queries_for_page(
         self,
@@ -181,14 +314,8 @@ class GSCClient:
         request = {
             'startDate': start_date,
             'endDate': end_date,
-            'dimensions': ['query'],
-            'dimensionFilterGroups': [{
-                'filters': [{
-                    'dimension': 'page',
-                    'operator': 'equals',
-                    'expression': page_url
-                }]
-            }],
+            'dimensions': _DIMS_QUERY,
+            'dimensionFilterGroups': _page_filter(page_url),
             'rowLimit': limit
         }
 
@@ -210,11 +337,13 @@ class GSCClient:
         self,
         page_url: str,
         start_date: str,
-        end_date: str
+        end_date: str,
+        min_impressions: int = 0
     ) -> Optional[Dict]:
         """Get page metrics with top queries"""
-        page_data = self.get_page_metrics(page_url, start_date, end_date)
+        page_data = self.get_page_metrics(page_url, start_date, end_date, min_impressions)
         if not page_data:
+            # Below threshold or no data - skip the queries round-trip
             return None
 
         queries = self.get_queries_for_page(page_url, start_date, end_date)
@@ -242,18 +371,24 @@ class GSCClient:
             (20.5, 100.0)
         ]
 
-        benchmarks = []
-        for min_pos, max_pos in position_bands:
-            band_pages = [
-                p for p in pages
-                if min_pos <= p['position'] < max_pos
-            ]
+        # Aggregate impressions/clicks per band in one pass over the pages
+        # (bands are contiguous, so bisect on the lower bounds finds the band)
+        band_mins = [band[0] for band in position_bands]
+        totals = [[0, 0, 0] for _ in position_bands]  # impressions, clicks, pages
+        for p in pages:
+            position = p['position']
+            if position < position_bands[0][0] or position >= position_bands[-1][1]:
+                continue
+            idx = bisect_right(band_mins, position) - 1
+            band = totals[idx]
+            band[0] += p['impressions']
+            band[1] += p['clicks']
+            band[2] += 1
 
-            if band_pages:
+        benchmarks = []
+        for (min_pos, max_pos), (total_impressions, total_clicks, sample_size) in zip(position_bands, totals):
+            if sample_size:
                 # Use weighted average CTR
-                total_impressions = sum(p['impressions'] for p in band_pages)
-                total_clicks = sum(p['clicks'] for p in band_pages)
-
                 if total_impressions > 0:
                     weighted_ctr = total_clicks / total_impressions
                 else:
@@ -263,7 +398,7 @@ class GSCClient:
                     'position_min': min_pos,
                     'position_max': max_pos,
                     'expected_ctr': weighted_ctr,
-                    'sample_size': len(band_pages)
+                    'sample_size': sample_size
                 })
 
         return benchmarks
@@ -277,79 +412,104 @@ class GSCClient:
 
         Returns None if the change is too recent to have valid data.
         """
-        # GSC data has ~3 day delay
-        end_date = datetime.now() - timedelta(days=3)
-
-        if last_change_date:
-            # Start from day after change
-            start_date = last_change_date + timedelta(days=1)
-
-            # If change is too recent (start_date >= end_date), no valid data yet
-            if start_date >= end_date:
-                return None
-
-            # Don't go back further than max_days
-            earliest = end_date - timedelta(days=max_days)
-            if start_date < earliest:
-                start_date = earliest
-        else:
-            # No changes, use last max_days
-            start_date = end_date - timedelta(days=max_days)
-
-        return (
-            start_date.strftime('%Y-%m-%d'),
-            end_date.strftime('%Y-%m-%d')
+        # Deterministic per (change date, max_days, today) - memoized so the
+        # per-page analysis loop collapses duplicate computations
+        return _valid_range_cached(
+            last_change_date.isoformat() if last_change_date else None,
+            max_days,
+            datetime.now().strftime('%Y-%m-%d')
         )
 
     def get_page_first_seen_date(self, page_url: str) -> Optional[str]:
         """
         Find when a page first appeared in GSC (got first impressions).
 
-        Queries backwards in monthly chunks from today to 16 months ago
-        to find the earliest date where the page had impressions > 0.
+        One date-dimension query over the full 16-month retention window
+        (at most ~480 daily rows, well under the 25k row limit) replaces
+        the old walk of up to 16 serial 30-day requests, and pins the
+        first impression to the exact day rather than a chunk boundary.
 
         Returns:
             Date string in 'YYYY-MM-DD' format, or None if page not found in GSC data
         """
-        # GSC keeps data for ~16 months
-        max_lookback_days = 16 * 30
-        end_date = datetime.now() - timedelta(days=3)  # Account for GSC delay
+        # GSC keeps data for ~16 months, with a ~3 day reporting delay
+        end_date = datetime.now() - timedelta(days=3)
+        start_date = end_date - timedelta(days=16 * 30)
 
-        # Query backwards in 30-day chunks
-        chunk_days = 30
-        current_end = end_date
+        rows = self._query({
+            'startDate': start_date.strftime('%Y-%m-%d'),
+            'endDate': end_date.strftime('%Y-%m-%d'),
+            'dimensions': _DIMS_DATE,
+            'dimensionFilterGroups': _page_filter(page_url),
+            'rowLimit': 25000
+        })
 
         earliest_seen = None
+        for row in rows:
+            if row.get('impressions', 0) > 0:
+                row_date = row['keys'][0]
+                if earliest_seen is None or row_date < earliest_seen:
+                    earliest_seen = row_date
+        return earliest_seen
 
-        for _ in range(max_lookback_days // chunk_days):
-            current_start = current_end - timedelta(days=chunk_days)
+    def _url_to_slug(self, url: str) -> str:
+        """Extract slug from full URL"""
+        return _SLUG_PREFIX_RE.sub('', url).rstrip('/')
+
+
+@lru_cache(maxsize=256)
+def _valid_range_cached(
+    last_change_iso: Optional[str],
+    max_days: int,
+    today_iso: str
+) -> Optional[Tuple[str, str]]:
+    """Pure date-range computation behind get_valid_date_range.
+
+    Keyed on today's date so cached entries expire daily.
+    """
+    # GSC data has ~3 day delay
+    end_date = datetime.fromisoformat(today_iso) - timedelta(days=3)
+
+    if last_change_iso:
+        # Start from day after change
+        last_change_date = datetime.fromisoformat(last_change_iso)
+        if last_change_date.tzinfo is not None:
+            last_change_date = last_change_date.replace(tzinfo=None)
+        start_date = last_change_date + timedelta(days=1)
+
+        # If change is too recent (start_date >= end_date), no valid data yet
+        if start_date >= end_date:
+            return None
 
-            # Get metrics for this chunk
-            metrics = self.get_page_metrics(
-                page_url,
-                current_start.strftime('%Y-%m-%d'),
-                current_end.strftime('%Y-%m-%d')
-            )
+        # Don't go back further than max_days
+        earliest = end_date - timedelta(days=max_days)
+        if start_date < earliest:
+            start_date = earliest
+    else:
+        # No changes, use last max_days
+        start_date = end_date - timedelta(days=max_days)
 
-            if metrics and metrics['impressions'] > 0:
-                # Page has data in this chunk, keep looking backwards
-                earliest_seen = current_end.strftime('%Y-%m-%d')
-                current_end = current_start
-            else:
-                # No data in this chunk, we've gone too far back
-                break
+    return (
+        start_date.strftime('%Y-%m-%d'),
+        end_date.strftime('%Y-%m-%d')
+    )
 
-        return earliest_seen
 
-    def _url_to_slug(self, url: str) -> str:
-        """Extract slug from full URL"""
-        # Remove site URL prefix
-        slug = url.replace(SITE_URL, '').replace('https://themeaningmovement.com/', '')
-        # Remove trailing slash
-        slug = slug.rstrip('/')
-        return slug
+# One authenticated client per process: building the discovery service
+# and re-reading credentials costs ~0.5s per instantiation, and the
+# singleton also keeps the per-page metrics cache warm across callers.
+# Sharing the instance across the thread pools in analysis/measurement
+# is only safe because _query uses a per-thread transport (_http) —
+# keep that invariant if the query path ever changes.
+_client = None
+_client_lock = threading.Lock()
 
 
 def get_gsc_client() -> GSCClient:
     """Factory function to get GSC client instance"""
-    return GSCClient()
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GSCClient()
+    return _client
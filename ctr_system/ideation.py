@@ -3,10 +3,16 @@
 # ABOUTME: Generates 10 variations using Claude CLI (uses existing Claude Code subscription)
 
 import json
-import re
 import subprocess
 from typing import List, Dict, Optional
 
+# orjson parses CLI responses ~3x faster; stdlib json is the fallback,
+# mirroring the optional import in the database layer
+try:
+    import orjson as _json_impl
+except ImportError:
+    _json_impl = json
+
 from .config import (
     CLAUDE_MODEL,
     IDEAS_PER_PAGE,
@@ -30,7 +36,7 @@ def call_claude_cli(prompt: str) -> str:
             raise RuntimeError(f"Claude CLI error: {result.stderr}")
 
         # Parse the JSON output to extract the response text
-        output = json.loads(result.stdout)
+        output = _json_impl.loads(result.stdout)
 
         # The output format has a 'result' field with the response
         if isinstance(output, dict) and 'result' in output:
@@ -43,8 +49,9 @@ def call_claude_cli(prompt: str) -> str:
 
     except subprocess.TimeoutExpired:
         raise RuntimeError("Claude CLI timed out after 120 seconds")
-    except json.JSONDecodeError:
-        # If not valid JSON, return raw stdout
+    except ValueError:
+        # Not valid JSON (either parser raises a ValueError subclass);
+        # return raw stdout
         return result.stdout
     except FileNotFoundError:
         raise RuntimeError("Claude CLI not found. Ensure 'claude' is in PATH.")
@@ -147,19 +154,23 @@ Return ONLY the JSON array, no other text."""
 
     response_text = call_claude_cli(prompt)
 
-    # Extract JSON from response (handle potential markdown formatting)
-    json_match = re.search(r'\[[\s\S]*\]', response_text)
-    if json_match:
-        ideas = json.loads(json_match.group())
+    # Extract JSON from response (handle potential markdown formatting).
+    # Slicing between the outermost brackets matches what the old greedy
+    # regex found, without backtracking over a multi-KB response.
+    start = response_text.find('[')
+    end = response_text.rfind(']')
+    if start != -1 and end > start:
+        ideas = _json_impl.loads(response_text[start:end + 1])
     else:
         raise ValueError(f"Could not parse ideas from response: {response_text[:200]}")
 
-    # Validate and clean ideas
-    valid_ideas = []
-    for idea in ideas:
-        if len(idea['text']) <= MAX_TITLE_LENGTH:
-            idea['char_count'] = len(idea['text'])
-            valid_ideas.append(idea)
+    # Validate and clean ideas: one len() per idea, and recompute
+    # char_count rather than trusting the model's arithmetic
+    valid_ideas = [
+        {**idea, 'char_count': n}
+        for idea in ideas
+        if (n := len(idea['text'])) <= MAX_TITLE_LENGTH
+    ]
 
     # Store in database
     db.store_title_ideas(page_url, valid_ideas, review_id)
@@ -189,13 +200,15 @@ def select_best_idea(
         for idea_type in IDEA_TYPES:
             type_scores[idea_type['type']] = 50  # Default 50%
 
+    # Idea types recently tried on this page (same for every idea)
+    recent_types = {exp['idea_type'] for exp in experiment_history[:3]}
+
     # Score each idea
     scored_ideas = []
     for idea in ideas:
         score = type_scores.get(idea['type'], 50)
 
         # Bonus for idea types not recently tried on this page
-        recent_types = [exp['idea_type'] for exp in experiment_history[:3]]
         if idea['type'] not in recent_types:
             score += 10  # Diversity bonus
 
@@ -4,18 +4,31 @@
 
 import base64
 import requests
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Optional, List, Dict
 
 from .config import WP_SITE_URL, WP_USER, WP_APP_PASSWORD
 from . import database as db
 
+# Shared session reuses the TLS connection to the WordPress host across
+# calls instead of handshaking per request; the pool is sized for the
+# orchestrator's concurrent workers
+_session = requests.Session()
+_session.mount('https://', requests.adapters.HTTPAdapter(
+    pool_connections=16, pool_maxsize=16))
+
+
+@lru_cache(maxsize=1)
+def _auth_token() -> str:
+    """Base64 Basic Auth token, computed once (credentials never change at runtime)"""
+    credentials = f"{WP_USER}:{WP_APP_PASSWORD}"
+    return base64.b64encode(credentials.encode()).decode()
+
 
 def get_auth_headers() -> Dict[str, str]:
     """Create Basic Auth headers for WordPress REST API"""
-    credentials = f"{WP_USER}:{WP_APP_PASSWORD}"
-    token = base64.b64encode(credentials.encode()).decode()
     return {
-        "Authorization": f"Basic {token}",
+        "Authorization": f"Basic {_auth_token()}",
         "Content-Type": "application/json"
     }
 
@@ -23,7 +36,7 @@ def get_auth_headers() -> Dict[str, str]:
 def get_post_id_from_slug(slug: str) -> Optional[int]:
     """Get WordPress post ID from slug"""
     url = f"{WP_SITE_URL}/wp-json/wp/v2/posts?slug={slug}"
-    response = requests.get(url)
+    response = _session.get(url)
 
     if response.status_code == 200:
         posts = response.json()
@@ -32,10 +45,58 @@ def get_post_id_from_slug(slug: str) -> Optional[int]:
     return None
 
 
+# Post ids never change for a slug, so resolved ones are kept for the
+# life of the process; failures are not cached so a flaky REST call
+# can be retried
+_post_id_cache: Dict[str, int] = {}
+
+
+def resolve_post_id(slug: str) -> Optional[int]:
+    """Resolve a slug to its post id, preferring cache and DB over REST"""
+    post_id = _post_id_cache.get(slug)
+    if post_id is None:
+        post_id = db.get_known_post_id(slug) or get_post_id_from_slug(slug)
+        if post_id:
+            _post_id_cache[slug] = post_id
+    return post_id
+
+
+def get_posts_by_slugs(slugs: List[str]) -> Dict[str, Dict]:
+    """Fetch posts for many slugs at once (100 per request).
+
+    Returns slug -> post dict with id, title and meta; resolved ids are
+    also fed into the slug cache so later lookups skip REST entirely.
+    """
+    posts: Dict[str, Dict] = {}
+    url = f"{WP_SITE_URL}/wp-json/wp/v2/posts"
+    for i in range(0, len(slugs), 100):
+        chunk = slugs[i:i + 100]
+        response = _session.get(url, headers=get_auth_headers(), params={
+            'slug': ','.join(chunk),
+            'per_page': 100,
+            '_fields': 'id,slug,title,meta',
+        })
+        if response.status_code != 200:
+            print(f"  API Error: {response.status_code} - {response.text[:200]}")
+            continue
+        for post in response.json():
+            posts[post['slug']] = post
+            _post_id_cache[post['slug']] = post['id']
+    return posts
+
+
+def get_title_from_post(post: Dict) -> str:
+    """Current title from a fetched post (RankMath title if set)"""
+    rm_title = (post.get('meta') or {}).get('rank_math_title', '')
+    if rm_title:
+        return rm_title
+    return post.get('title', {}).get('rendered', '')
+
+
 def get_current_title(post_id: int) -> str:
     """Get current title (RankMath SEO title or post title)"""
     url = f"{WP_SITE_URL}/wp-json/wp/v2/posts/{post_id}"
-    response = requests.get(url, headers=get_auth_headers())
+    response = _session.get(url, headers=get_auth_headers())
 
     if response.status_code == 200:
         post = response.json()
@@ -61,7 +122,7 @@ def update_rankmath_title(post_id: int, new_title: str) -> bool:
         "rank_math_title": new_title
     }
 
-    response = requests.post(url, headers=get_auth_headers(), json=data)
+    response = _session.post(url, headers=get_auth_headers(), json=data)
 
     if response.status_code != 200:
         print(f"  API Error: {response.status_code} - {response.text[:200]}")
@@ -82,18 +143,20 @@ def implement_title_change(
     pre_clicks: int,
     pre_start_date: str,
     pre_end_date: str,
-    review_id: Optional[int] = None
+    review_id: Optional[int] = None,
+    old_title: Optional[str] = None
 ) -> Optional[int]:
     """Implement a title change and create experiment record"""
 
     # Get post ID
-    post_id = get_post_id_from_slug(page_slug)
+    post_id = resolve_post_id(page_slug)
     if not post_id:
         print(f"  Could not find post ID for {page_slug}")
         return None
 
-    # Get current title
-    old_title = get_current_title(post_id)
+    # Get current title, unless the caller already fetched it
+    if old_title is None:
+        old_title = get_current_title(post_id)
 
     # Update via RankMath API
     success = update_rankmath_title(post_id, new_title)
@@ -101,8 +164,9 @@ def implement_title_change(
         print(f"  Failed to update title for {page_slug}")
         return None
 
-    # Create experiment record
-    experiment_id = db.create_experiment(
+    # Create experiment record plus the seo_changes entry for the
+    # existing system, committed together
+    experiment_id = db.create_experiment_with_change_log(
         page_url=page_url,
         page_slug=page_slug,
         wp_post_id=post_id,
@@ -119,66 +183,46 @@ def implement_title_change(
         review_id=review_id
     )
 
-    # Also log to seo_changes for compatibility with existing system
-    conn = db.get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        INSERT INTO seo_changes
-        (page_url, wp_post_id, field_changed, old_value, new_value,
-         change_reason, gsc_ctr_at_change, gsc_impressions_at_change, gsc_clicks_at_change)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-        page_url, post_id, 'rank_math_title',
-        old_title, new_title,
-        f"CTR experiment: {hypothesis}",
-        pre_ctr * 100,  # Store as percentage
-        pre_impressions, pre_clicks
-    ))
-    conn.commit()
-    conn.close()
-
     print(f"  ✅ Updated: {old_title[:40]}... → {new_title[:40]}...")
     return experiment_id
 
 
 def revert_experiment(experiment_id: int) -> bool:
     """Revert an experiment to its original title"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT page_slug, wp_post_id, old_title, new_title
-        FROM optimization_experiments
-        WHERE id = ?
-    """, (experiment_id,))
-
-    row = cursor.fetchone()
-    if not row:
-        print(f"  Experiment {experiment_id} not found")
-        conn.close()
-        return False
-
-    page_slug = row['page_slug']
-    post_id = row['wp_post_id']
-    old_title = row['old_title']
-
-    # Revert title
-    success = update_rankmath_title(post_id, old_title)
-    if not success:
-        print(f"  Failed to revert {page_slug}")
-        conn.close()
-        return False
-
-    # Update experiment status
-    cursor.execute("""
-        UPDATE optimization_experiments
-        SET status = 'reverted',
-            ended_at = CURRENT_TIMESTAMP
-        WHERE id = ?
-    """, (experiment_id,))
-
-    conn.commit()
-    conn.close()
+    ph = db._placeholder()
+    with db.get_connection() as conn:
+        cursor = db._get_cursor(conn)
+
+        cursor.execute(f"""
+            SELECT page_slug, wp_post_id, old_title, new_title
+            FROM optimization_experiments
+            WHERE id = {ph}
+        """, (experiment_id,))
+
+        row = cursor.fetchone()
+        if not row:
+            print(f"  Experiment {experiment_id} not found")
+            return False
+
+        page_slug = row['page_slug']
+        post_id = row['wp_post_id']
+        old_title = row['old_title']
+
+        # Revert title
+        success = update_rankmath_title(post_id, old_title)
+        if not success:
+            print(f"  Failed to revert {page_slug}")
+            return False
+
+        # Update experiment status
+        cursor.execute(f"""
+            UPDATE optimization_experiments
+            SET status = 'reverted',
+                ended_at = CURRENT_TIMESTAMP
+            WHERE id = {ph}
+        """, (experiment_id,))
+
+        conn.commit()
 
     print(f"  ↩️  Reverted {page_slug} to original title")
     return True
@@ -2,6 +2,8 @@
 # ABOUTME: Measurement and evaluation module for CTR experiments
 # ABOUTME: Updates metrics, determines outcomes, extracts learnings
 
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 
@@ -13,15 +15,20 @@ from .config import (
     MAX_DAYS_FOR_EVALUATION
 )
 from . import database as db
-from .gsc_client import get_gsc_client
 
 
-def update_experiment_metrics(experiment: Dict) -> Dict:
+def update_experiment_metrics(experiment: Dict, client=None) -> Dict:
     """Update post-change metrics for an experiment"""
-    client = get_gsc_client()
+    if client is None:
+        # Deferred: pulls in the Google API stack, which summary-only
+        # callers of this module never need
+        from .gsc_client import get_gsc_client
+        client = get_gsc_client()
 
     page_url = experiment['page_url']
-    started_at = datetime.fromisoformat(experiment['started_at'])
+    started_at = experiment['started_at']
+    if isinstance(started_at, str):  # Both backends normally return datetime
+        started_at = datetime.fromisoformat(started_at)
 
     # Get metrics from day after change to now
     start_date, end_date = client.get_valid_date_range(started_at)
@@ -138,11 +145,22 @@ def update_all_active_experiments() -> List[Dict]:
     experiments = db.get_active_experiments()
     print(f"  Found {len(experiments)} active experiments")
 
-    results = []
-    for exp in experiments:
+    if not experiments:
+        return []
+
+    from .gsc_client import get_gsc_client
+    client = get_gsc_client()
+
+    def _update(exp: Dict) -> Dict:
         print(f"  Updating: {exp['page_slug']}...")
-        updated = update_experiment_metrics(exp)
-        results.append(updated)
+        return update_experiment_metrics(exp, client=client)
+
+    # Each experiment is an independent GSC round-trip plus a DB write,
+    # so overlap them like the bulk fetches in gsc_client do. Sharing one
+    # client across workers is safe: GSCClient._query gives every thread
+    # its own httplib2 transport.
+    with ThreadPoolExecutor(max_workers=min(8, len(experiments))) as executor:
+        results = list(executor.map(_update, experiments))
 
     return results
 
@@ -176,6 +194,9 @@ def evaluate_ready_experiments() -> List[Dict]:
 
         print(f"    → {evaluation['outcome']}: {evaluation['reason']}")
 
+    if results:
+        _summary_cache['value'] = None  # Completions change the summary
+
     return results
 
 
@@ -217,32 +238,53 @@ def check_for_significant_changes() -> List[Dict]:
     return alerts
 
 
+# The monthly flow asks for the summary several times in one run
+# (report body, Slack text, email subject); cache it briefly like the
+# TTL caches in the database layer
+_summary_cache = {'value': None, 'at': 0.0}
+_SUMMARY_TTL = 60.0
+
+
 def get_experiment_summary() -> Dict:
-    """Get summary of all experiments"""
-    conn = db.get_connection()
-    cursor = conn.cursor()
-
-    # Active experiments
-    cursor.execute("SELECT COUNT(*) as cnt FROM optimization_experiments WHERE status = 'active'")
-    active = cursor.fetchone()['cnt']
-
-    # Completed experiments by outcome
-    cursor.execute("""
-        SELECT outcome, COUNT(*) as cnt, AVG(ctr_change_pct) as avg_change
-        FROM optimization_experiments
-        WHERE status = 'completed' AND outcome IS NOT NULL
-        GROUP BY outcome
-    """)
-    outcomes = {row['outcome']: {'count': row['cnt'], 'avg_change': row['avg_change']}
-                for row in cursor.fetchall()}
-
-    # Overall success rate
-    total_completed = sum(o['count'] for o in outcomes.values())
+    """Get summary of all experiments (cached briefly)"""
+    now = time.monotonic()
+    if _summary_cache['value'] is not None and now - _summary_cache['at'] < _SUMMARY_TTL:
+        return _summary_cache['value']
+
+    summary = _fetch_experiment_summary()
+    _summary_cache['value'] = summary
+    _summary_cache['at'] = now
+    return summary
+
+
+def _fetch_experiment_summary() -> Dict:
+    """Query the experiment summary from the database"""
+    with db.get_connection() as conn:
+        cursor = db._get_cursor(conn)
+        # One aggregate pass over the table instead of separate
+        # active-count and per-outcome queries
+        cursor.execute("""
+            SELECT status, outcome, COUNT(*) as cnt, AVG(ctr_change_pct) as avg_change
+            FROM optimization_experiments
+            WHERE status = 'active'
+               OR (status = 'completed' AND outcome IS NOT NULL)
+            GROUP BY status, outcome
+        """)
+        groups = cursor.fetchall()
+
+    active = 0
+    total_completed = 0
+    outcomes = {}
+    for row in groups:
+        if row['status'] == 'active':
+            active += row['cnt']
+        else:
+            outcomes[row['outcome']] = {'count': row['cnt'], 'avg_change': row['avg_change']}
+            total_completed += row['cnt']
+
     improved = outcomes.get('improved', {}).get('count', 0)
     success_rate = (improved / total_completed * 100) if total_completed > 0 else 0
 
-    conn.close()
-
     return {
         'active': active,
         'completed': total_completed,
@@ -2,12 +2,21 @@
 # ABOUTME: Notification system for CTR optimization
 # ABOUTME: Sends alerts via Slack webhook and/or email
 
+import atexit
+import hashlib
 import json
 import smtplib
+import threading
+import time
+from datetime import datetime
+from html import escape as _e
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional, List
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from .config import (
     SLACK_WEBHOOK_URL,
@@ -15,12 +24,64 @@ from .config import (
     SMTP_PORT,
     SMTP_USER,
     SMTP_PASSWORD,
-    NOTIFICATION_EMAIL
+    NOTIFICATION_EMAIL,
+    NOTIFY_ON_EMPTY
 )
+from . import database as db
+
+_OUTCOME_EMOJI = {
+    'improved': '✅',
+    'worsened': '❌',
+    'no_change': '➖',
+    'inconclusive': '❓'
+}
+
+# Slack posts are fire-and-forget; a small pool keeps webhook latency
+# off the review/measurement threads. shutdown(wait=True) at exit
+# flushes anything still queued before the process dies.
+_NOTIFY_POOL = ThreadPoolExecutor(max_workers=4)
+atexit.register(_NOTIFY_POOL.shutdown, wait=True)
+
+# Pooled session: back-to-back notifications reuse the TLS connection
+# to hooks.slack.com instead of handshaking per post, with a short
+# retry budget for transient webhook hiccups
+_session = requests.Session()
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=4,
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+    ),
+))
+
+
+def _post_slack(payload: dict) -> bool:
+    """Worker: POST a payload to the Slack webhook"""
+    try:
+        response = _session.post(
+            SLACK_WEBHOOK_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=(3, 5)  # a hung endpoint must not wedge the pool
+        )
+        return response.status_code == 200
+    except Exception as e:
+        print(f"  Slack error: {e}")
+        return False
+
+
+# Identical messages fired in a burst (e.g. alert loops) collapse to
+# one webhook call within this window
+_DEDUP_WINDOW = 30.0
+_inflight: dict = {}
+_inflight_lock = threading.Lock()
 
 
 def send_slack_message(message: str, blocks: Optional[List] = None) -> bool:
-    """Send message to Slack via webhook"""
+    """Queue a message to Slack via webhook (sent on a background thread)"""
     if not SLACK_WEBHOOK_URL:
         print("  Slack webhook not configured, skipping...")
         return False
@@ -29,44 +90,101 @@ def send_slack_message(message: str, blocks: Optional[List] = None) -> bool:
     if blocks:
         payload["blocks"] = blocks
 
-    try:
-        response = requests.post(
-            SLACK_WEBHOOK_URL,
-            json=payload,
-            headers={"Content-Type": "application/json"}
-        )
-        return response.status_code == 200
-    except Exception as e:
-        print(f"  Slack error: {e}")
-        return False
+    key = hashlib.blake2b(
+        (message + json.dumps(blocks or [])).encode(), digest_size=8
+    ).hexdigest()
+    now = time.monotonic()
+    with _inflight_lock:
+        sent_at = _inflight.get(key)
+        if sent_at is not None and now - sent_at < _DEDUP_WINDOW:
+            return True  # Duplicate of a recently queued message
+        _inflight[key] = now
+
+    _NOTIFY_POOL.submit(_post_slack, payload)
+    return True
+
+
+# Connection setup (connect + STARTTLS + login) is roughly half the
+# cost of a send, so the authenticated session is kept open and reused
+_smtp_lock = threading.Lock()
+_smtp_conn: Optional[smtplib.SMTP] = None
+
+
+def _get_smtp() -> smtplib.SMTP:
+    """Return the shared SMTP connection, reconnecting if it dropped"""
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.noop()
+            return _smtp_conn
+        except (smtplib.SMTPException, OSError):
+            _drop_smtp()
+
+    conn = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=10)
+    conn.starttls()
+    conn.login(SMTP_USER, SMTP_PASSWORD)
+    _smtp_conn = conn
+    return conn
+
+
+def _drop_smtp() -> None:
+    """Discard the shared SMTP connection"""
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.close()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _smtp_conn = None
+
+
+def _quit_smtp() -> None:
+    """Politely close the shared SMTP connection at exit"""
+    global _smtp_conn
+    if _smtp_conn is not None:
+        try:
+            _smtp_conn.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _smtp_conn = None
+
+
+atexit.register(_quit_smtp)
 
 
 def send_email(subject: str, body: str, html: bool = False) -> bool:
     """Send email notification"""
-    if not all([SMTP_HOST, SMTP_USER, SMTP_PASSWORD, NOTIFICATION_EMAIL]):
+    if not (SMTP_HOST and SMTP_USER and SMTP_PASSWORD and NOTIFICATION_EMAIL):
         print("  Email not configured, skipping...")
         return False
 
-    try:
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = SMTP_USER
-        msg['To'] = NOTIFICATION_EMAIL
-
-        if html:
-            msg.attach(MIMEText(body, 'html'))
-        else:
-            msg.attach(MIMEText(body, 'plain'))
-
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(msg)
-
-        return True
-    except Exception as e:
-        print(f"  Email error: {e}")
-        return False
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = SMTP_USER
+    msg['To'] = NOTIFICATION_EMAIL
+
+    if html:
+        msg.attach(MIMEText(body, 'html'))
+    else:
+        msg.attach(MIMEText(body, 'plain'))
+
+    with _smtp_lock:
+        try:
+            _get_smtp().send_message(msg)
+            return True
+        except (smtplib.SMTPException, OSError):
+            # Stale connection (e.g. server idle timeout): reconnect once
+            _drop_smtp()
+            try:
+                _get_smtp().send_message(msg)
+                return True
+            except Exception as e:
+                print(f"  Email error: {e}")
+                _drop_smtp()
+                return False
+        except Exception as e:
+            print(f"  Email error: {e}")
+            return False
 
 
 def notify_monthly_review_complete(
@@ -97,6 +215,10 @@ def notify_weekly_status(
 ) -> None:
     """Send weekly status notification"""
 
+    # Quiet weeks are the common case; skip the post unless asked for
+    if active_experiments == 0 and not alerts and not NOTIFY_ON_EMPTY:
+        return
+
     if alerts:
         alert_text = "\n".join([f"• {a['message']}" for a in alerts])
         message = f"""📊 *CTR Weekly Status*
@@ -146,14 +268,7 @@ def notify_experiment_complete(
 ) -> None:
     """Notify when an experiment is completed"""
 
-    emoji_map = {
-        'improved': '✅',
-        'worsened': '❌',
-        'no_change': '➖',
-        'inconclusive': '❓'
-    }
-
-    emoji = emoji_map.get(outcome, '❓')
+    emoji = _OUTCOME_EMOJI.get(outcome, '❓')
 
     message = f"""{emoji} *Experiment Complete*
 
@@ -173,13 +288,15 @@ def send_monthly_report_email(
     report_path: str
 ) -> bool:
     """Send detailed monthly report email with all CTR changes and title updates"""
-    from datetime import datetime
-    from . import database as db
-
     month_name = datetime.now().strftime('%B %Y')
 
-    # Build HTML email
-    html = f"""
+    # Nothing to report: skip the HTML build and SMTP session entirely
+    if not completed_experiments and not experiments_started:
+        send_slack_message(f"No CTR activity in {month_name}")
+        return False
+
+    # Build HTML email as a list of fragments joined once at the end
+    parts = [f"""
 <!DOCTYPE html>
 <html>
 <head>
@@ -222,15 +339,29 @@ def send_monthly_report_email(
             <div class="label">Success Rate</div>
         </div>
     </div>
-"""
+"""]
 
     # Completed experiments section
     if completed_experiments:
-        improved = [e for e in completed_experiments if e.get('outcome') == 'improved']
-        worsened = [e for e in completed_experiments if e.get('outcome') == 'worsened']
-        no_change = [e for e in completed_experiments if e.get('outcome') == 'no_change']
+        # Tally outcomes in one pass; only the counts are used below
+        n_improved = n_worsened = n_no_change = 0
+        for e in completed_experiments:
+            outcome = e.get('outcome')
+            if outcome == 'improved':
+                n_improved += 1
+            elif outcome == 'worsened':
+                n_worsened += 1
+            elif outcome == 'no_change':
+                n_no_change += 1
+
+        # One batched query for every page's CTR history instead of a
+        # lookup per experiment row
+        progressions = db.format_ctr_progression_bulk(
+            [e['page_url'] for e in completed_experiments if e.get('page_url')],
+            months=3
+        )
 
-        html += """
+        parts.append("""
     <h2>📊 Completed Experiments</h2>
     <table>
         <tr>
@@ -239,7 +370,7 @@ def send_monthly_report_email(
             <th>CTR Change</th>
             <th>Result</th>
         </tr>
-"""
+""")
         for exp in completed_experiments:
             outcome = exp.get('outcome', 'unknown')
             ctr_change = exp.get('ctr_change_pct', 0)
@@ -252,38 +383,37 @@ def send_monthly_report_email(
             else:
                 change_class = 'no-change'
 
-            # Get CTR history for this page
-            page_url = exp.get('page_url', '')
-            ctr_progression = db.format_ctr_progression(page_url, months=3) if page_url else "N/A"
+            # CTR history for this page, from the batched lookup above
+            ctr_progression = progressions.get(exp.get('page_url', ''), "N/A")
 
-            html += f"""
+            parts.append(f"""
         <tr>
             <td>
-                <strong>{exp.get('page_slug', 'N/A')}</strong>
-                <div class="ctr-history">📈 {ctr_progression}</div>
+                <strong>{_e(exp.get('page_slug') or 'N/A')}</strong>
+                <div class="ctr-history">📈 {_e(ctr_progression)}</div>
             </td>
             <td>
-                <div class="old-title">{exp.get('old_title', 'N/A')}</div>
-                <div class="new-title">{exp.get('new_title', 'N/A')}</div>
+                <div class="old-title">{_e(exp.get('old_title') or 'N/A')}</div>
+                <div class="new-title">{_e(exp.get('new_title') or 'N/A')}</div>
             </td>
             <td class="ctr-change {change_class}">{ctr_change:+.1f}%</td>
             <td class="{outcome_class}">{outcome.replace('_', ' ').title()}</td>
         </tr>
-"""
-        html += "</table>"
+""")
+        parts.append("</table>")
 
         # Summary of results
-        html += f"""
+        parts.append(f"""
     <p>
-        <span class="improved">✅ {len(improved)} improved</span> &nbsp;|&nbsp;
-        <span class="worsened">❌ {len(worsened)} worsened</span> &nbsp;|&nbsp;
-        <span class="no-change">➖ {len(no_change)} no change</span>
+        <span class="improved">✅ {n_improved} improved</span> &nbsp;|&nbsp;
+        <span class="worsened">❌ {n_worsened} worsened</span> &nbsp;|&nbsp;
+        <span class="no-change">➖ {n_no_change} no change</span>
     </p>
-"""
+""")
 
     # New experiments section
     if experiments_started:
-        html += """
+        parts.append("""
     <h2>🚀 New Experiments Started</h2>
     <table>
         <tr>
@@ -291,28 +421,28 @@ def send_monthly_report_email(
             <th>Old Title → New Title</th>
             <th>Hypothesis</th>
         </tr>
-"""
+""")
         for exp in experiments_started:
-            html += f"""
+            parts.append(f"""
         <tr>
-            <td><strong>{exp.get('page_slug', 'N/A')}</strong></td>
+            <td><strong>{_e(exp.get('page_slug') or 'N/A')}</strong></td>
             <td>
-                <div class="old-title">{exp.get('old_title', 'N/A')}</div>
-                <div class="new-title">{exp.get('new_title', 'N/A')}</div>
+                <div class="old-title">{_e(exp.get('old_title') or 'N/A')}</div>
+                <div class="new-title">{_e(exp.get('new_title') or 'N/A')}</div>
             </td>
-            <td>{exp.get('hypothesis', 'N/A')[:100]}...</td>
+            <td>{_e((exp.get('hypothesis') or 'N/A')[:100])}...</td>
         </tr>
-"""
-        html += "</table>"
+""")
+        parts.append("</table>")
 
-    html += f"""
+    parts.append(f"""
     <div class="footer">
-        <p>Full report saved to: {report_path}</p>
+        <p>Full report saved to: {_e(str(report_path))}</p>
         <p>Generated automatically by CTR Optimization System</p>
     </div>
 </body>
 </html>
-"""
+""")
 
     subject = f"🎯 CTR Report {month_name}: {len(completed_experiments)} completed, {len(experiments_started)} new"
-    return send_email(subject, html, html=True)
+    return send_email(subject, "".join(parts), html=True)
@@ -2,7 +2,7 @@
 # ABOUTME: Report generation for CTR optimization system
 # ABOUTME: Creates markdown reports for monthly reviews and experiment results
 
-import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -11,6 +11,13 @@ from .config import REPORTS_DIR
 from . import database as db
 from .measurement import get_experiment_summary
 
+_OUTCOME_EMOJI = {'improved': '✅', 'worsened': '❌', 'no_change': '➖'}
+
+
+def _truncate(s: str, n: int) -> str:
+    """Truncate a table cell to n characters with an ellipsis"""
+    return s if len(s) <= n else s[:n] + '...'
+
 
 def generate_monthly_report(
     review_id: int,
@@ -22,8 +29,10 @@ def generate_monthly_report(
     """Generate comprehensive monthly report"""
 
     review = db.get_latest_review()
-    review_date = datetime.now().strftime('%Y-%m-%d')
-    review_month = datetime.now().strftime('%B %Y')
+    # One clock read so header date and month can't straddle midnight
+    now = datetime.now()
+    review_date = now.strftime('%Y-%m-%d')
+    review_month = now.strftime('%B %Y')
 
     # Get experiment summary
     summary = get_experiment_summary()
@@ -74,10 +83,10 @@ def generate_monthly_report(
         ])
 
         for exp in completed_experiments:
-            old = (exp.get('old_title', '')[:30] + '...') if len(exp.get('old_title', '')) > 30 else exp.get('old_title', '')
-            new = (exp.get('new_title', '')[:30] + '...') if len(exp.get('new_title', '')) > 30 else exp.get('new_title', '')
+            old = _truncate(exp.get('old_title', ''), 30)
+            new = _truncate(exp.get('new_title', ''), 30)
             change = f"{exp.get('ctr_change_pct', 0):+.1f}%"
-            outcome_emoji = {'improved': '✅', 'worsened': '❌', 'no_change': '➖'}.get(exp.get('outcome', ''), '❓')
+            outcome_emoji = _OUTCOME_EMOJI.get(exp.get('outcome', ''), '❓')
 
             lines.append(f"| {exp.get('page_slug', '')} | {old} | {new} | {change} | {outcome_emoji} {exp.get('outcome', '')} |")
 
@@ -103,8 +112,8 @@ def generate_monthly_report(
         ])
 
         for exp in experiments_started:
-            title = (exp.get('new_title', '')[:40] + '...') if len(exp.get('new_title', '')) > 40 else exp.get('new_title', '')
-            hypothesis = (exp.get('hypothesis', '')[:50] + '...') if len(exp.get('hypothesis', '')) > 50 else exp.get('hypothesis', '')
+            title = _truncate(exp.get('new_title', ''), 40)
+            hypothesis = _truncate(exp.get('hypothesis', ''), 50)
 
             lines.append(f"| {exp.get('page_slug', '')} | {title} | {exp.get('idea_type', '')} | {hypothesis} |")
 
@@ -129,11 +138,9 @@ def generate_monthly_report(
                 "",
             ])
 
-            # Top queries
+            # Top queries (decoded to lists by the database layer)
             queries = opp.get('top_queries', [])
             if queries:
-                if isinstance(queries, str):
-                    queries = json.loads(queries)
                 lines.append("**Top Queries:**")
                 for q in queries[:5]:
                     lines.append(f"  - \"{q.get('query', '')}\" ({q.get('impressions', 0):,} imp)")
@@ -168,18 +175,22 @@ def generate_monthly_report(
 
 
 def save_report(report_content: str, review_id: int) -> str:
-    """Save report to file and update database"""
-
-    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    """Save report to file; the caller records the path when it
+    finalizes the review (db.finalize_monthly_review)"""
 
+    # REPORTS_DIR is created once at config import; no per-call mkdir
     filename = f"ctr_review_{datetime.now().strftime('%Y%m')}.md"
     filepath = REPORTS_DIR / filename
 
-    with open(filepath, 'w') as f:
+    # Explicit utf-8 (the report is full of emoji; the platform default
+    # may not be) and write-then-rename so a crash mid-write never
+    # leaves a truncated report behind
+    tmp = filepath.with_suffix(filepath.suffix + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
         f.write(report_content)
-
-    # Update review record with report path
-    db.complete_monthly_review(review_id, str(filepath))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
 
     return str(filepath)
 
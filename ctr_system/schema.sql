@@ -19,6 +19,8 @@ CREATE TABLE IF NOT EXISTS seo_changes (
 CREATE INDEX IF NOT EXISTS idx_seo_changes_url ON seo_changes(page_url);
 CREATE INDEX IF NOT EXISTS idx_seo_changes_date ON seo_changes(changed_at);
 CREATE INDEX IF NOT EXISTS idx_seo_changes_post ON seo_changes(wp_post_id);
+-- Covering index so per-page MAX(changed_at) is an index endpoint probe
+CREATE INDEX IF NOT EXISTS idx_seo_changes_url_time ON seo_changes(page_url, changed_at DESC);
 
 -- Site-specific CTR expectations by position band
 -- Used to calculate "expected CTR" for gap analysis
@@ -202,6 +204,7 @@ CREATE TABLE IF NOT EXISTS gsc_page_metrics (
     -- Timestamps
     pulled_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     review_id INTEGER,
+    review_month CHAR(7),  -- Denormalized from monthly_reviews for join-free history reads
 
     FOREIGN KEY (review_id) REFERENCES monthly_reviews(id)
 );
@@ -211,8 +214,13 @@ CREATE INDEX IF NOT EXISTS idx_experiments_status ON optimization_experiments(st
 CREATE INDEX IF NOT EXISTS idx_experiments_page ON optimization_experiments(page_url);
 CREATE INDEX IF NOT EXISTS idx_ideas_page ON title_ideas(page_url);
 CREATE INDEX IF NOT EXISTS idx_ideas_used ON title_ideas(selected, used_at);
+CREATE INDEX IF NOT EXISTS idx_ideas_page_selected ON title_ideas(page_url, selected);
 CREATE INDEX IF NOT EXISTS idx_gsc_metrics_review ON gsc_page_metrics(review_id);
 CREATE INDEX IF NOT EXISTS idx_gsc_metrics_eligible ON gsc_page_metrics(eligible_for_optimization);
+-- Covering indexes for the hottest WHERE/ORDER BY patterns
+CREATE INDEX IF NOT EXISTS idx_gsc_metrics_review_impact ON gsc_page_metrics(review_id, impact_score DESC) WHERE eligible_for_optimization = 1;
+CREATE INDEX IF NOT EXISTS idx_gsc_metrics_page_review ON gsc_page_metrics(page_url, review_id);
+CREATE INDEX IF NOT EXISTS idx_experiments_active_eval ON optimization_experiments(min_evaluation_date) WHERE status = 'active';
 
 -- View: Active experiments needing measurement
 CREATE VIEW IF NOT EXISTS v_active_experiments AS
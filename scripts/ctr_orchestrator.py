@@ -4,58 +4,64 @@
 
 import argparse
 import sys
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
 # Add project root to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from ctr_system.config import (
-    validate_config,
-    MIN_CTR_GAP_PERCENT,
-    MIN_IMPACT_SCORE,
-    MAX_EXPERIMENTS_PER_MONTH,
-    REPORTS_DIR
-)
-from ctr_system import database as db
-from ctr_system.gsc_client import get_gsc_client
-from ctr_system.analysis import (
-    refresh_benchmarks,
-    analyze_all_pages,
-    get_top_opportunities,
-    calculate_potential_impact,
-    generate_analysis_summary
-)
-from ctr_system.ideation import generate_and_select
-from ctr_system.implementation import implement_title_change, get_current_title, get_post_id_from_slug
-from ctr_system.measurement import (
-    update_all_active_experiments,
-    evaluate_ready_experiments,
-    check_for_significant_changes,
-    get_experiment_summary
-)
-from ctr_system.reporting import (
-    generate_monthly_report,
-    save_report,
-    generate_weekly_status
-)
-from ctr_system.notifications import (
-    notify_monthly_review_complete,
-    notify_weekly_status,
-    notify_alert,
-    send_monthly_report_email
-)
-
-
-def run_monthly_review(dry_run: bool = False):
+# ctr_system imports live inside each mode function: they pull in the
+# Google API client, requests and the database layer, which is a lot of
+# startup cost for `--help` or a bad argument
+
+
+def run_monthly_review(dry_run: bool = False, quiet: bool = False):
     """Run the full monthly review process"""
-    print("=" * 60)
-    print("CTR MONTHLY REVIEW")
-    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print(f"Mode: {'DRY RUN' if dry_run else 'LIVE'}")
-    print("=" * 60)
-    print()
+    from ctr_system.config import (
+        validate_config,
+        MIN_CTR_GAP_PERCENT,
+        MIN_IMPACT_SCORE,
+        MAX_EXPERIMENTS_PER_MONTH
+    )
+    from ctr_system import database as db
+    from ctr_system.gsc_client import get_gsc_client
+    from ctr_system.analysis import (
+        refresh_benchmarks,
+        analyze_all_pages,
+        get_top_opportunities,
+        calculate_potential_impact
+    )
+    from ctr_system.ideation import generate_and_select
+    from ctr_system.implementation import (
+        implement_title_change,
+        get_current_title,
+        get_posts_by_slugs,
+        get_title_from_post,
+        resolve_post_id
+    )
+    from ctr_system.measurement import (
+        evaluate_ready_experiments,
+        check_for_significant_changes,
+        get_experiment_summary
+    )
+    from ctr_system.reporting import generate_monthly_report, save_report
+    from ctr_system.notifications import (
+        notify_monthly_review_complete,
+        notify_alert,
+        send_monthly_report_email
+    )
+
+    # Banners go out as one write apiece; per-step logs stay as
+    # individual prints so they appear as the run progresses
+    print("\n".join([
+        "=" * 60,
+        "CTR MONTHLY REVIEW",
+        f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        f"Mode: {'DRY RUN' if dry_run else 'LIVE'}",
+        "=" * 60,
+        "",
+    ]))
 
     if not validate_config():
         print("Configuration validation failed. Exiting.")
@@ -87,7 +93,8 @@ def run_monthly_review(dry_run: bool = False):
     print("STEP 3: Identifying optimization opportunities...")
     print(f"  Thresholds: CTR gap ≥{MIN_CTR_GAP_PERCENT}%, Impact score ≥{MIN_IMPACT_SCORE}")
     opportunities = get_top_opportunities(review_id)
-    print(f"  Found {len(opportunities)} pages meeting criteria")
+    n_opps = len(opportunities)
+    print(f"  Found {n_opps} pages meeting criteria")
 
     impact = calculate_potential_impact(opportunities)
     print(f"  Potential impact: +{impact['potential_gain']:,} clicks")
@@ -99,38 +106,71 @@ def run_monthly_review(dry_run: bool = False):
     print(f"  Completed {len(completed)} experiments")
     print()
 
+    # Quiet month: nothing to optimize and nothing newly completed means
+    # the experiment loop, report and notifications would all be empty.
+    # Alerts still fire; the review record still gets its stats.
+    if not opportunities and not completed:
+        print("No opportunities or completed experiments; skipping optimization and report.")
+        alerts = check_for_significant_changes()
+        for alert in alerts:
+            print(f"  {alert['message']}")
+            if not dry_run:
+                notify_alert(alert)
+        db.update_review_stats(
+            review_id=review_id,
+            total_pages=len(all_pages),
+            pages_eligible=0,
+            opportunities=0,
+            experiments_proposed=0,
+            experiments_started=0
+        )
+        return True
+
     # Step 5: Generate ideas and implement for ALL opportunities meeting criteria
-    num_to_optimize = len(opportunities)
-    print(f"STEP 5: Optimizing {num_to_optimize} pages meeting criteria...")
-    if num_to_optimize == MAX_EXPERIMENTS_PER_MONTH:
+    print(f"STEP 5: Optimizing {n_opps} pages meeting criteria...")
+    if n_opps == MAX_EXPERIMENTS_PER_MONTH:
         print(f"  ⚠️  Hit safety limit of {MAX_EXPERIMENTS_PER_MONTH} - consider raising thresholds")
     experiments_started = []
 
-    for i, opp in enumerate(opportunities, 1):
+    # One batched WP lookup for every slug instead of two REST
+    # round-trips per page inside the loop
+    post_map = get_posts_by_slugs([o['page_slug'] for o in opportunities]) if opportunities else {}
+
+    def _process_opportunity(opp):
+        """Optimize one page; returns (output lines, started experiment or None)"""
         page_url = opp['page_url']
         page_slug = opp['page_slug']
 
-        print(f"\n[{i}/{num_to_optimize}] {page_slug}")
-        print(f"  Current CTR: {opp['current_ctr']*100:.2f}% (expected {opp['expected_ctr']*100:.2f}%)")
-        print(f"  Gap: {opp['ctr_gap_pct']:.1f}%, Impact: {opp['impact_score']:.1f}")
+        out = [
+            f"{page_slug}",
+            f"  Current CTR: {opp['current_ctr']*100:.2f}% (expected {opp['expected_ctr']*100:.2f}%)",
+            f"  Gap: {opp['ctr_gap_pct']:.1f}%, Impact: {opp['impact_score']:.1f}",
+        ]
 
         try:
-            # Get current title
-            post_id = get_post_id_from_slug(page_slug)
-            if not post_id:
-                print(f"  ⚠️ Could not find post ID, skipping")
-                continue
-
-            current_title = get_current_title(post_id)
-            print(f"  Current title: {current_title[:50]}...")
-
-            # Get queries
+            # Get current title (from the batch; REST fallback for
+            # slugs the batch lookup missed)
+            post = post_map.get(page_slug)
+            if post:
+                post_id = post['id']
+                current_title = get_title_from_post(post)
+            else:
+                post_id = resolve_post_id(page_slug)
+                if not post_id:
+                    out.append(f"  ⚠️ Could not find post ID, skipping")
+                    return out, None
+                current_title = get_current_title(post_id)
+            if not current_title:
+                # Don't burn an LLM call ideating against a blank title
+                out.append(f"  ⚠️ No title returned for post {post_id}, skipping")
+                return out, None
+            out.append(f"  Current title: {current_title[:50]}...")
+
+            # Get queries (decoded to lists by the database layer)
             queries = opp.get('top_queries', [])
-            if isinstance(queries, str):
-                queries = json.loads(queries)
 
             # Generate and select best idea
-            print(f"  Generating title ideas...")
+            out.append(f"  Generating title ideas...")
             result = generate_and_select(
                 page_url=page_url,
                 page_slug=page_slug,
@@ -143,61 +183,86 @@ def run_monthly_review(dry_run: bool = False):
             )
 
             selected = result['selected']
-            print(f"  Selected: {selected['text']} [{selected['type']}]")
-            print(f"  Hypothesis: {selected['hypothesis']}")
+            out.append(f"  Selected: {selected['text']} [{selected['type']}]")
+            out.append(f"  Hypothesis: {selected['hypothesis']}")
 
             if dry_run:
-                print(f"  [DRY RUN] Would update title")
-                experiments_started.append({
+                out.append(f"  [DRY RUN] Would update title")
+                return out, {
                     'page_slug': page_slug,
                     'old_title': current_title,
                     'new_title': selected['text'],
                     'idea_type': selected['type'],
                     'hypothesis': selected['hypothesis']
-                })
-            else:
-                # Implement the change
-                experiment_id = implement_title_change(
-                    page_url=page_url,
-                    page_slug=page_slug,
-                    new_title=selected['text'],
-                    hypothesis=selected['hypothesis'],
-                    idea_type=selected['type'],
-                    pre_ctr=opp['current_ctr'],
-                    pre_position=opp['position'],
-                    pre_impressions=opp['impressions'],
-                    pre_clicks=opp['clicks'],
-                    pre_start_date=start_date,
-                    pre_end_date=end_date,
-                    review_id=review_id
-                )
-
-                if experiment_id:
-                    experiments_started.append({
-                        'id': experiment_id,
-                        'page_slug': page_slug,
-                        'old_title': current_title,
-                        'new_title': selected['text'],
-                        'idea_type': selected['type'],
-                        'hypothesis': selected['hypothesis']
-                    })
+                }
+
+            # Implement the change
+            experiment_id = implement_title_change(
+                page_url=page_url,
+                page_slug=page_slug,
+                new_title=selected['text'],
+                hypothesis=selected['hypothesis'],
+                idea_type=selected['type'],
+                pre_ctr=opp['current_ctr'],
+                pre_position=opp['position'],
+                pre_impressions=opp['impressions'],
+                pre_clicks=opp['clicks'],
+                pre_start_date=start_date,
+                pre_end_date=end_date,
+                review_id=review_id,
+                old_title=current_title
+            )
+
+            if experiment_id:
+                return out, {
+                    'id': experiment_id,
+                    'page_slug': page_slug,
+                    'old_title': current_title,
+                    'new_title': selected['text'],
+                    'idea_type': selected['type'],
+                    'hypothesis': selected['hypothesis']
+                }
+            return out, None
 
         except Exception as e:
-            print(f"  ❌ Error: {e}")
-            continue
+            out.append(f"  ❌ Error: {e}")
+            return out, None
+
+    # Each opportunity is dominated by network latency (WP REST + the
+    # Claude CLI call), so run a few in flight at once. Output is
+    # buffered per page and printed whole as each finishes.
+    if opportunities:
+        with ThreadPoolExecutor(max_workers=min(4, n_opps)) as executor:
+            futures = [executor.submit(_process_opportunity, opp) for opp in opportunities]
+            for i, future in enumerate(as_completed(futures), 1):
+                out, started = future.result()
+                if not quiet:
+                    print(f"\n[{i}/{n_opps}] " + "\n".join(out))
+                if started:
+                    experiments_started.append(started)
 
     print()
 
-    # Step 6: Update review stats
-    eligible_count = len([o for o in opportunities if o.get('eligible', True)])
-    db.update_review_stats(
-        review_id=review_id,
-        total_pages=len(all_pages),
-        pages_eligible=eligible_count,
-        opportunities=len(opportunities),
-        experiments_proposed=len(opportunities),
-        experiments_started=len(experiments_started)
-    )
+    # Step 6: Collect review stats (written with the completion update
+    # in one statement once the report is saved)
+    eligible_count = sum(1 for o in opportunities if o.get('eligible', True))
+    review_stats = {
+        'total_pages': len(all_pages),
+        'pages_eligible': eligible_count,
+        'opportunities': n_opps,
+        'experiments_proposed': n_opps,
+        'experiments_started': len(experiments_started),
+    }
+    if dry_run:
+        # No completion write happens in a dry run; record stats now
+        db.update_review_stats(
+            review_id=review_id,
+            total_pages=review_stats['total_pages'],
+            pages_eligible=review_stats['pages_eligible'],
+            opportunities=review_stats['opportunities'],
+            experiments_proposed=review_stats['experiments_proposed'],
+            experiments_started=review_stats['experiments_started']
+        )
 
     # Step 7: Check for alerts
     print("STEP 6: Checking for alerts...")
@@ -224,6 +289,7 @@ def run_monthly_review(dry_run: bool = False):
 
     if not dry_run:
         report_path = save_report(report_content, review_id)
+        db.finalize_monthly_review(review_id, review_stats, report_path)
         print(f"  Report saved to: {report_path}")
     else:
         report_path = "[DRY RUN - not saved]"
@@ -231,12 +297,9 @@ def run_monthly_review(dry_run: bool = False):
 
     # Print report to console
     print()
-    print("=" * 60)
-    print("REPORT PREVIEW")
-    print("=" * 60)
-    print(report_content[:2000])
-    if len(report_content) > 2000:
-        print("... [truncated]")
+    print("\n".join(["=" * 60, "REPORT PREVIEW", "=" * 60]))
+    sys.stdout.write(report_content[:2000])
+    sys.stdout.write("\n... [truncated]\n" if len(report_content) > 2000 else "\n")
     print()
 
     # Step 9: Send notifications
@@ -265,26 +328,38 @@ def run_monthly_review(dry_run: bool = False):
     print()
 
     # Summary
-    print("=" * 60)
-    print("MONTHLY REVIEW COMPLETE")
-    print("=" * 60)
-    print(f"  Pages analyzed: {len(all_pages)}")
-    print(f"  Opportunities found: {len(opportunities)}")
-    print(f"  Experiments started: {len(experiments_started)}")
-    print(f"  Experiments completed: {len(completed)}")
-    print(f"  Report: {report_path}")
-    print()
+    print("\n".join([
+        "=" * 60,
+        "MONTHLY REVIEW COMPLETE",
+        "=" * 60,
+        f"  Pages analyzed: {len(all_pages)}",
+        f"  Opportunities found: {n_opps}",
+        f"  Experiments started: {len(experiments_started)}",
+        f"  Experiments completed: {len(completed)}",
+        f"  Report: {report_path}",
+        "",
+    ]))
 
     return True
 
 
 def run_weekly_measurement(dry_run: bool = False):
     """Run weekly measurement update"""
-    print("=" * 60)
-    print("CTR WEEKLY MEASUREMENT")
-    print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    print("=" * 60)
-    print()
+    from ctr_system.measurement import (
+        update_all_active_experiments,
+        evaluate_ready_experiments,
+        check_for_significant_changes
+    )
+    from ctr_system.reporting import generate_weekly_status
+    from ctr_system.notifications import notify_weekly_status, notify_alert
+
+    print("\n".join([
+        "=" * 60,
+        "CTR WEEKLY MEASUREMENT",
+        f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}",
+        "=" * 60,
+        "",
+    ]))
 
     # Update all active experiments
     print("Updating active experiment metrics...")
@@ -314,11 +389,7 @@ def run_weekly_measurement(dry_run: bool = False):
     # Generate status
     status = generate_weekly_status(active, alerts)
 
-    print("=" * 60)
-    print("STATUS")
-    print("=" * 60)
-    print(status)
-    print()
+    print("\n".join(["=" * 60, "STATUS", "=" * 60, status, ""]))
 
     # Send notification
     if not dry_run:
@@ -330,10 +401,10 @@ def run_weekly_measurement(dry_run: bool = False):
 
 def show_status():
     """Show current system status"""
-    print("=" * 60)
-    print("CTR SYSTEM STATUS")
-    print("=" * 60)
-    print()
+    from ctr_system import database as db
+    from ctr_system.measurement import get_experiment_summary
+
+    print("\n".join(["=" * 60, "CTR SYSTEM STATUS", "=" * 60, ""]))
 
     summary = get_experiment_summary()
 
@@ -374,11 +445,13 @@ def main():
                        help='Operation mode')
     parser.add_argument('--dry-run', action='store_true',
                        help='Run without making changes')
+    parser.add_argument('--quiet', action='store_true',
+                       help='Suppress per-page progress output (for cron runs)')
 
     args = parser.parse_args()
 
     if args.mode == 'monthly':
-        run_monthly_review(dry_run=args.dry_run)
+        run_monthly_review(dry_run=args.dry_run, quiet=args.quiet)
     elif args.mode == 'weekly':
         run_weekly_measurement(dry_run=args.dry_run)
     elif args.mode == 'status':
@@ -40,28 +40,21 @@ def log_current_gsc_data(days: int = 7):
     pages = client.get_all_pages(start_str, end_str, min_impressions=1)
     print(f"Found {len(pages)} pages with impressions")
 
-    # Log data for each page
-    logged_count = 0
-    for i, page in enumerate(pages):
-        page_url = page['page_url']
-
-        # Log this data point
-        db.log_historical_gsc_data(
-            page_url=page_url,
-            data_date=end_str,  # Use end date as the snapshot date
-            impressions=page['impressions'],
-            clicks=page['clicks'],
-            ctr=page['ctr'],
-            position=page['position']
+    # Log all pages in one transaction instead of a commit per page
+    db.log_historical_gsc_data_bulk([
+        (
+            page['page_url'],
+            end_str,  # Use end date as the snapshot date
+            page['impressions'],
+            page['clicks'],
+            page['ctr'],
+            page['position']
         )
-
-        logged_count += 1
-
-        if (i + 1) % 100 == 0:
-            print(f"  Logged {i + 1}/{len(pages)} pages...")
+        for page in pages
+    ])
 
     print()
-    print(f"✓ Logged {logged_count} pages to historical data")
+    print(f"✓ Logged {len(pages)} pages to historical data")
     print(f"  Database now contains data spanning beyond GSC's 16-month window")
 
 